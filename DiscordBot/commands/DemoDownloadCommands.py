@@ -309,7 +309,7 @@ async def continuous_download_loop(category: str, month: str, limit: int, bot, u
         # Check if parser is running, if not, start it
         from commands.parser.service import parser_task, parser_loop, stop_parser_event
         
-        if not parser_stats['is_running']:
+        if not parser_stats.is_running:
             # Start parser in continuous mode for this month
             logger.info(f"Starting parser in continuous mode for {month}")
             
@@ -362,7 +362,7 @@ async def continuous_download_loop(category: str, month: str, limit: int, bot, u
             logger.info("Waiting for parser to finish processing before downloading next batch...")
             
             # Check if parser is running
-            while parser_stats['is_running']:
+            while parser_stats.is_running:
                 # Check every 10 seconds if parser is still running
                 for _ in range(10):
                     if download_stop_event.is_set():
@@ -396,7 +396,7 @@ async def continuous_download_loop(category: str, month: str, limit: int, bot, u
                     await asyncio.sleep(30)
             
             # If parser is not running, wait a bit to make sure it's really done
-            if not parser_stats['is_running']:
+            if not parser_stats.is_running:
                 await asyncio.sleep(5)
             
             # Wait a bit before starting next batch
@@ -18,13 +18,20 @@ from commands.parser.utils import (
     async_read_file_lines,
     async_write_file_lines,
     async_append_file_line,
-    retry_operation
+    async_append_file_lines,
+    retry_operation,
+    AdaptiveConcurrencyLimiter,
+    ServiceOverloadError,
+    ParserStats
 )
 
 from commands.parser.config import (
     get_config,
+    get_config_async,
     get_month_files,
     get_available_months,
+    get_available_months_async,
+    clear_available_months_cache,
     get_demo_path,
     get_demo_path_async
 )
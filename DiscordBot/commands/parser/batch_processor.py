@@ -6,7 +6,7 @@ import os
 import time
 import logging
 import asyncio
-import aiofiles
+from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 
 from commands.parser.utils import (
@@ -14,17 +14,35 @@ from commands.parser.utils import (
     format_time_duration,
     async_read_file_lines,
     async_write_file_lines,
-    async_append_file_line,
+    async_append_file_lines,
     retry_operation,
-    extract_uuid_from_demo_id
+    extract_uuid_from_demo_id,
+    alphabetize_file,
+    alphabetize_lines,
+    AdaptiveConcurrencyLimiter,
+    ServiceOverloadError,
+    ParserStats
 )
 from commands.parser.config import get_config, get_demo_path_async
 from commands.parser.demo_processor import process_demo
 
 logger = logging.getLogger('discord_bot')
 
+# Number of times a demo is attempted when the host reports resource exhaustion
+MAX_OVERLOAD_ATTEMPTS = 3
+
+# Seconds to wait before the first overload retry; doubled for every further retry
+OVERLOAD_BACKOFF_SECONDS = 5
+
+# Number of batches a demo may be deferred for overloads before it is rejected after all
+MAX_OVERLOAD_DEFERRALS = 3
+
+# Demo UUID -> number of batches it was deferred in because the host stayed overloaded
+_overload_deferrals: Dict[str, int] = {}
+
 async def process_month_queue_async(month: str, config: Dict, stop_event: asyncio.Event, 
-                                   parser_stats: Dict, limit: int = None, parallel_limit: int = 5) -> Tuple[Dict, str]:
+                                   parser_stats: ParserStats, limit: int = None, parallel_limit: int = 5,
+                                   concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None) -> Tuple[Dict, str]:
     """
     Process the parsing queue for a specific month with parallel processing
     
@@ -32,9 +50,11 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
         month: Month name (e.g., "February")
         config: Configuration dictionary
         stop_event: Event to signal stopping
-        parser_stats: Dictionary to track parser statistics
+        parser_stats: Parser statistics to update
         limit: Maximum number of demos to process, or None for all
         parallel_limit: Maximum number of demos to process in parallel
+        concurrency_limiter: Optional shared limiter that adapts parallelism across batches;
+                             a new one capped at parallel_limit is created if not provided
         
     Returns:
         Tuple[Dict, str]: Processing statistics and completion message
@@ -65,15 +85,11 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
         'quad_matchids': os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
     }
     
-    # Create rejected file if it doesn't exist
-    if not os.path.exists(files['rejected']):
-        async with aiofiles.open(files['rejected'], 'w', encoding='utf-8') as f:
-            pass
-    
-    # Create parsed file if it doesn't exist
-    if not os.path.exists(files['parsed']):
-        async with aiofiles.open(files['parsed'], 'w', encoding='utf-8') as f:
-            pass
+    # Create rejected and parsed files if they don't exist
+    await asyncio.gather(
+        asyncio.to_thread(Path(files['rejected']).touch, exist_ok=True),
+        asyncio.to_thread(Path(files['parsed']).touch, exist_ok=True)
+    )
     
     # Read queue with retry
     queue = list(await retry_operation(
@@ -94,6 +110,14 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
         logger.info(f"Processing {len(queue)} demos for {month}")
         print(f"Processing queue for {month}: {len(queue)} demos")
     
+    # Bind the file paths used on the per-demo hot path once
+    parsed_path = files['parsed']
+    queue_path = files['parse_queue']
+    rejected_path = files['rejected']
+    
+    # UUIDs of failed demos, removed from the ace/quad matchid files at the end of the batch
+    failed_uuids: Set[str] = set()
+    
     # Track start time for this batch
     start_time = time.time()
     
@@ -101,8 +125,14 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
     batch_kill_collections = 0
     batch_tickbytick_files = 0
     
-    # Create a semaphore to limit concurrent processing
-    semaphore = asyncio.Semaphore(parallel_limit)
+    # parallel_limit is a hard cap; the limiter only lowers the parallelism while the host is overloaded
+    if concurrency_limiter is None:
+        concurrency_limiter = AdaptiveConcurrencyLimiter(parallel_limit)
+    worker_count = min(parallel_limit, concurrency_limiter.max_concurrency)
+    
+    # Bounded work queue - a fixed pool of workers drains it, so only a handful
+    # of demos are waiting to be picked up at any time
+    work_queue = asyncio.Queue(maxsize=parallel_limit * 2)
     
     # Create a lock for synchronizing file updates
     queue_update_lock = asyncio.Lock()
@@ -118,9 +148,80 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
     failed_demos = []
     skipped_demos = []
     
-    async def process_demo_with_semaphore(demo_id: str):
-        """Process a demo with semaphore control"""
-        nonlocal batch_kill_collections, batch_tickbytick_files, successful_count, last_queue_update_time
+    # Every demo that left the queue (successful, skipped or failed) for O(1) membership tests
+    processed_ids: Set[str] = set()
+    
+    # Failed demo IDs waiting to be appended to the rejected file
+    rejected_buffer: List[str] = []
+    
+    async def flush_rejected_buffer():
+        """Append all buffered failures to the rejected file (caller holds queue_update_lock)"""
+        if not rejected_buffer:
+            return
+        pending = list(rejected_buffer)
+        await retry_operation(
+            lambda: async_append_file_lines(rejected_path, pending)
+        )
+        rejected_buffer.clear()
+    
+    # Only one task writes the queue/rejected files at a time; flushes requested
+    # while one is running are coalesced into it through flush_pending
+    flush_lock = asyncio.Lock()
+    flush_pending = False
+    
+    async def flush_queue_updates():
+        """Write pending queue removals and rejected entries to disk without holding queue_update_lock"""
+        nonlocal flush_pending
+        
+        # Another task is already flushing and will pick up our changes
+        if flush_lock.locked():
+            return
+        
+        async with flush_lock:
+            while flush_pending:
+                flush_pending = False
+                
+                # Take the buffered failures, then release the lock before touching disk
+                async with queue_update_lock:
+                    pending_rejected = list(rejected_buffer)
+                    rejected_buffer.clear()
+                
+                try:
+                    # Read current queue
+                    current_queue = list(await retry_operation(
+                        lambda: async_read_file_lines(queue_path)
+                    ))
+                    
+                    # Remove processed, skipped and failed demos
+                    updated_queue = [d for d in current_queue if d not in processed_ids]
+                    
+                    # Write updated queue
+                    if len(updated_queue) != len(current_queue):
+                        await retry_operation(
+                            lambda: async_write_file_lines(queue_path, updated_queue, use_temp_file=True)
+                        )
+                    
+                    # Persist buffered failures so a crash doesn't lose them
+                    if pending_rejected:
+                        await retry_operation(
+                            lambda: async_append_file_lines(rejected_path, pending_rejected)
+                        )
+                except Exception as e:
+                    # Don't fail the demo that triggered the flush; keep the failures buffered and leave
+                    # the queue removals in processed_ids so the next flush (or the final update) retries them
+                    async with queue_update_lock:
+                        rejected_buffer[:0] = pending_rejected
+                    logger.error(f"Error updating queue file for {month}: {str(e)}")
+                    break
+                
+                # Log update
+                removed_count = len(current_queue) - len(updated_queue)
+                logger.info(f"Updated queue file: removed {removed_count} demos, {len(updated_queue)} remaining")
+                print(f"[✓] Updated queue: removed {removed_count} demos, {len(updated_queue)} remaining")
+    
+    async def process_single_demo(demo_id: str):
+        """Process a single demo and record its outcome"""
+        nonlocal batch_kill_collections, batch_tickbytick_files, successful_count, last_queue_update_time, flush_pending
         
         # Check if stop event is set
         if stop_event.is_set():
@@ -132,7 +233,7 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
         
         # Read parsed demos
         parsed_demos = await retry_operation(
-            lambda: async_read_file_lines(files['parsed'])
+            lambda: async_read_file_lines(parsed_path)
         )
         
         # Check if any parsed demo has the same UUID
@@ -150,11 +251,12 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
             # Add to skipped demos
             async with queue_update_lock:
                 skipped_demos.append(demo_id)
+                processed_ids.add(demo_id)
                 
             return demo_id, None  # None indicates skipped
         
         # Get demo path
-        demo_path = await get_demo_path_async(demo_id, month)
+        demo_path = await get_demo_path_async(demo_id, month, config)
         if not demo_path:
             logger.warning(f"Demo file not found for ID: {demo_id}")
             print(f"[✗] Skipped demo: {format_match_id(demo_id)} - File not found")
@@ -162,32 +264,81 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
             # Add to skipped demos
             async with queue_update_lock:
                 skipped_demos.append(demo_id)
+                processed_ids.add(demo_id)
                 
             return demo_id, None  # None indicates skipped
         
-        # Track kill collections and tickbytick files before processing
-        kill_collections_before = parser_stats['kill_collections']
-        tickbytick_files_before = parser_stats['tickbytick_files']
+        # Count this demo's kill collections and tickbytick files separately, so demos (and months)
+        # processed at the same time don't show up in each other's counts
+        demo_stats = ParserStats()
+        
+        # Process the demo, backing off and retrying if the host runs out of resources
+        success = False
+        overloaded = False
+        for attempt in range(1, MAX_OVERLOAD_ATTEMPTS + 1):
+            if attempt > 1:
+                # Exponential backoff before retrying, cut short if the parser is stopped
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=OVERLOAD_BACKOFF_SECONDS * 2 ** (attempt - 2))
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            
+            try:
+                async with concurrency_limiter:
+                    success = await process_demo(demo_id, demo_path, month, demo_stats, stop_event)
+            except ServiceOverloadError as e:
+                overloaded = True
+                concurrency_limiter.record_overload()
+                logger.warning(f"Overload processing {demo_id} (attempt {attempt}/{MAX_OVERLOAD_ATTEMPTS}): {str(e)}")
+                continue
+            
+            overloaded = False
+            if success:
+                concurrency_limiter.record_success()
+            break
+        
+        if overloaded:
+            deferrals = _overload_deferrals.get(demo_uuid, 0)
+            if not stop_event.is_set():
+                deferrals += 1
+            
+            if deferrals < MAX_OVERLOAD_DEFERRALS:
+                # An overload says nothing about the demo itself, so leave it in the parse queue
+                # for a later batch instead of rejecting it
+                _overload_deferrals[demo_uuid] = deferrals
+                logger.warning(f"Host overloaded while processing {demo_id}, leaving it in the queue "
+                               f"(deferral {deferrals}/{MAX_OVERLOAD_DEFERRALS})")
+                print(f"[!] Deferred demo: {format_match_id(demo_id)} - Host overloaded")
+                
+                async with queue_update_lock:
+                    skipped_demos.append(demo_id)
+                
+                return demo_id, None  # None indicates skipped
+            
+            # Overloaded every time it was tried - most likely the demo itself, so reject it
+            logger.error(f"Rejecting {demo_id} after {deferrals} batches that ended in an overload")
         
-        # Process the demo with semaphore
-        async with semaphore:
-            success = await process_demo(demo_id, demo_path, month, parser_stats, stop_event)
+        _overload_deferrals.pop(demo_uuid, None)
         
         # Calculate how many new files were generated
-        batch_kill_collections += (parser_stats['kill_collections'] - kill_collections_before)
-        batch_tickbytick_files += (parser_stats['tickbytick_files'] - tickbytick_files_before)
+        batch_kill_collections += demo_stats.kill_collections
+        batch_tickbytick_files += demo_stats.tickbytick_files
+        parser_stats.kill_collections += demo_stats.kill_collections
+        parser_stats.tickbytick_files += demo_stats.tickbytick_files
         
         # Update parser stats
-        parser_stats['total_processed'] += 1
-        parser_stats['last_demo_id'] = demo_id
+        parser_stats.total_processed += 1
+        parser_stats.last_demo_id = demo_id
         
         if success:
-            parser_stats['successful'] += 1
+            parser_stats.successful += 1
             
             # Add to successful demos - but DON'T update parsed file yet
             # We'll update it at the end of batch processing to avoid race conditions
             async with queue_update_lock:
                 successful_demos.append(demo_id)
+                processed_ids.add(demo_id)
                 
                 # Just increment successful count
                 successful_count += 1
@@ -196,152 +347,108 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
                 current_time = time.time()
                 if (successful_count >= 5 or 
                     current_time - last_queue_update_time >= 30):  # Update every 30 seconds instead of 60
-                    
-                    # Read current queue
-                    current_queue = list(await retry_operation(
-                        lambda: async_read_file_lines(files['parse_queue'])
-                    ))
-                    
-                    # Remove successfully processed and skipped demos
-                    updated_queue = [d for d in current_queue if d not in successful_demos and d not in skipped_demos]
-                    
-                    # Write updated queue
-                    await retry_operation(
-                        lambda: async_write_file_lines(files['parse_queue'], updated_queue, use_temp_file=True)
-                    )
+                    flush_pending = True
                     
                     # Reset counters
                     successful_count = 0
                     last_queue_update_time = current_time
-                    
-                    # Log update
-                    removed_count = len(current_queue) - len(updated_queue)
-                    logger.info(f"Updated queue file: removed {removed_count} demos, {len(updated_queue)} remaining")
-                    print(f"[✓] Updated queue: removed {removed_count} demos, {len(updated_queue)} remaining")
+            
+            # Disk I/O happens outside queue_update_lock so other workers aren't blocked
+            if flush_pending:
+                await flush_queue_updates()
         else:
-            parser_stats['failed'] += 1
+            parser_stats.failed += 1
             
-            # Add to failed demos and update rejected file
+            # Add to failed demos and buffer it for the rejected file
             async with queue_update_lock:
                 failed_demos.append(demo_id)
+                processed_ids.add(demo_id)
+                rejected_buffer.append(demo_id)
                 
-                # Add to rejected file with retry
-                await retry_operation(
-                    lambda: async_append_file_line(files['rejected'], demo_id)
-                )
-                
-                # Remove from queue immediately to prevent further attempts
-                current_queue = list(await retry_operation(
-                    lambda: async_read_file_lines(files['parse_queue'])
-                ))
+                # Remove from queue as soon as possible to prevent further attempts
+                flush_pending = True
                 
-                if demo_id in current_queue:
-                    updated_queue = [d for d in current_queue if d != demo_id]
-                    await retry_operation(
-                        lambda: async_write_file_lines(files['parse_queue'], updated_queue, use_temp_file=True)
-                    )
-                    logger.info(f"Removed failed demo from queue: {demo_id}")
-                
-                # Remove from ace_matchids and quad_matchids files by UUID
-                for matchid_file in [files['ace_matchids'], files['quad_matchids']]:
-                    if os.path.exists(matchid_file):
+                # Remove from ace_matchids and quad_matchids by UUID; the files are updated at the end
+                failed_uuids.add(demo_uuid)
+            
+            await flush_queue_updates()
+            
+            # Delete the .dem and .dem.gz files
+            try:
+                # Get the demo path
+                demos_dir = config.get('project', {}).get('public_demos_directory', '')
+                if demos_dir:
+                    month_dir = os.path.join(demos_dir, month)
+                    if os.path.exists(month_dir):
                         try:
-                            # Read the file
-                            matchids = list(await retry_operation(
-                                lambda: async_read_file_lines(matchid_file)
-                            ))
-                            
-                            # Filter out entries with the same UUID
-                            updated_matchids = []
-                            for matchid in matchids:
-                                matchid_uuid = extract_uuid_from_demo_id(matchid)
-                                if matchid_uuid != demo_uuid:
-                                    updated_matchids.append(matchid)
-                                else:
-                                    logger.info(f"Removed failed demo from {os.path.basename(matchid_file)}: {matchid} (UUID: {demo_uuid})")
-                            
-                            # Write back if any were removed
-                            if len(updated_matchids) != len(matchids):
-                                # Sort the updated matchids before writing back
-                                updated_matchids.sort()
-                                
-                                await retry_operation(
-                                    lambda: async_write_file_lines(matchid_file, updated_matchids, use_temp_file=True)
-                                )
-                                
-                                # Also alphabetize the file to ensure it's properly sorted
-                                from commands.parser.utils import alphabetize_file
-                                await alphabetize_file(matchid_file, remove_duplicates=True)
-                                logger.info(f"Alphabetized {os.path.basename(matchid_file)} after removing failed demo")
+                            # Try to find the demo file by UUID
+                            for filename in os.listdir(month_dir):
+                                if demo_uuid in filename:
+                                    try:
+                                        # Delete .dem file
+                                        dem_path = os.path.join(month_dir, filename)
+                                        if os.path.exists(dem_path):
+                                            os.remove(dem_path)
+                                            logger.info(f"Deleted failed demo file: {dem_path}")
+                                        
+                                        # Delete .dem.gz file if it exists
+                                        gz_path = dem_path + '.gz'
+                                        if os.path.exists(gz_path):
+                                            os.remove(gz_path)
+                                            logger.info(f"Deleted failed demo archive file: {gz_path}")
+                                    except PermissionError as e:
+                                        logger.warning(f"Permission denied when deleting demo file {dem_path}: {str(e)}")
+                                    except Exception as e:
+                                        logger.error(f"Error deleting demo file {dem_path}: {str(e)}")
+                        except PermissionError as e:
+                            logger.warning(f"Permission denied when listing directory {month_dir}: {str(e)}")
                         except Exception as e:
-                            logger.error(f"Error removing failed demo from {os.path.basename(matchid_file)}: {str(e)}")
-                
-                # Delete the .dem and .dem.gz files
-                try:
-                    # Get the demo path
-                    demos_dir = config.get('project', {}).get('public_demos_directory', '')
-                    if demos_dir:
-                        month_dir = os.path.join(demos_dir, month)
-                        if os.path.exists(month_dir):
-                            try:
-                                # Try to find the demo file by UUID
-                                for filename in os.listdir(month_dir):
-                                    if demo_uuid in filename:
-                                        try:
-                                            # Delete .dem file
-                                            dem_path = os.path.join(month_dir, filename)
-                                            if os.path.exists(dem_path):
-                                                os.remove(dem_path)
-                                                logger.info(f"Deleted failed demo file: {dem_path}")
-                                            
-                                            # Delete .dem.gz file if it exists
-                                            gz_path = dem_path + '.gz'
-                                            if os.path.exists(gz_path):
-                                                os.remove(gz_path)
-                                                logger.info(f"Deleted failed demo archive file: {gz_path}")
-                                        except PermissionError as e:
-                                            logger.warning(f"Permission denied when deleting demo file {dem_path}: {str(e)}")
-                                        except Exception as e:
-                                            logger.error(f"Error deleting demo file {dem_path}: {str(e)}")
-                            except PermissionError as e:
-                                logger.warning(f"Permission denied when listing directory {month_dir}: {str(e)}")
-                            except Exception as e:
-                                logger.error(f"Error listing directory {month_dir}: {str(e)}")
-                except PermissionError as e:
-                    logger.warning(f"Permission denied when accessing demos directory: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Error deleting failed demo files: {str(e)}")
+                            logger.error(f"Error listing directory {month_dir}: {str(e)}")
+            except PermissionError as e:
+                logger.warning(f"Permission denied when accessing demos directory: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error deleting failed demo files: {str(e)}")
         
         return demo_id, success
     
-    # Process demos in parallel
-    tasks = []
-    for demo_id in queue:
-        if stop_event.is_set():
-            logger.info("Stop event detected, not queuing any more demos")
-            print("[!] Stop requested, finishing current demos but not starting new ones")
-            break
-        tasks.append(asyncio.create_task(process_demo_with_semaphore(demo_id)))
-    
-    # Wait for all tasks to complete
-    results = []
-    for task in asyncio.as_completed(tasks):
-        try:
-            result = await task
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Error in demo processing task: {str(e)}")
-    
-    # Process results and update stats
-    for demo_id, success in results:
-        stats['processed'] += 1
+    async def produce_demos():
+        """Feed demo IDs to the workers until the queue is exhausted or a stop is requested"""
+        for demo_id in queue:
+            if stop_event.is_set():
+                logger.info("Stop event detected, not queuing any more demos")
+                print("[!] Stop requested, finishing current demos but not starting new ones")
+                break
+            await work_queue.put(demo_id)
         
-        if success is None:  # Skipped
-            stats['skipped'] += 1
-        elif success:  # Successful
-            stats['successful'] += 1
-        else:  # Failed
-            stats['failed'] += 1
+        # One sentinel per worker so they all shut down
+        for _ in range(worker_count):
+            await work_queue.put(None)
+    
+    async def demo_worker():
+        """Process demos from the work queue, updating stats as each one finishes"""
+        while True:
+            demo_id = await work_queue.get()
+            if demo_id is None:
+                break
+            
+            stats['processed'] += 1
+            try:
+                _, success = await process_single_demo(demo_id)
+            except Exception as e:
+                # Count crashed demos as failures so processed stays accurate
+                logger.error(f"Error in demo processing task: {str(e)}")
+                stats['failed'] += 1
+                continue
+            
+            if success is None:  # Skipped
+                stats['skipped'] += 1
+            elif success:  # Successful
+                stats['successful'] += 1
+            else:  # Failed
+                stats['failed'] += 1
+    
+    # Process demos in parallel with a fixed pool of workers
+    await asyncio.gather(produce_demos(), *(demo_worker() for _ in range(worker_count)))
     
     # Final update of queue file - force removal of all processed demos
     try:
@@ -349,8 +456,8 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
             lambda: async_read_file_lines(files['parse_queue'])
         ))
         
-        # Explicitly remove all successful and skipped demos from queue
-        updated_queue = [d for d in current_queue if d not in successful_demos and d not in skipped_demos]
+        # Explicitly remove all processed demos from queue
+        updated_queue = [d for d in current_queue if d not in processed_ids]
         
         # Write updated queue with retry
         await retry_operation(
@@ -365,48 +472,63 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
         logger.error(f"Error in final queue update: {str(e)}")
         print(f"[!] Error in final queue update: {str(e)}")
     
-    # Final alphabetize of the rejected file
-    from commands.parser.utils import alphabetize_file
-    await alphabetize_file(files['rejected'], remove_duplicates=True)
-    logger.info(f"Final alphabetization and duplicate removal for {month} rejected file")
+    # Write all buffered failures to the rejected file in one go
+    try:
+        async with queue_update_lock:
+            await flush_rejected_buffer()
+    except Exception as e:
+        logger.error(f"Error writing rejected demos for {month}: {str(e)}")
     
     # Update the parsed file with all successfully processed demos
     # This is done at the end to avoid race conditions
     if successful_demos:
         logger.info(f"Adding {len(successful_demos)} successfully processed demos to parsed file")
         
-        # Read existing parsed file
-        parsed_demos = await retry_operation(
+        # Read existing parsed file as a set so UUIDs are deduplicated on write
+        parsed_demos = set(await retry_operation(
             lambda: async_read_file_lines(files['parsed'])
-        )
+        ))
         
-        # Extract UUIDs from successful demos
-        for demo_id in successful_demos:
-            # Remove prefix from demo_id before adding to parsed file
-            parsed_demo_id = extract_uuid_from_demo_id(demo_id)
-            parsed_demos.add(parsed_demo_id)
+        # Remove prefix from successful demo IDs before adding them to the parsed file
+        parsed_demos.update(extract_uuid_from_demo_id(demo_id) for demo_id in successful_demos)
         
-        # Write all parsed demos back to file
+        # Write all parsed demos back sorted, keeping one entry per UUID like alphabetize_file does
+        sorted_parsed = alphabetize_lines(parsed_demos, remove_duplicates=True, source=files['parsed'])
         await retry_operation(
-            lambda: async_write_file_lines(files['parsed'], list(parsed_demos), use_temp_file=True)
+            lambda: async_write_file_lines(files['parsed'], sorted_parsed, use_temp_file=True)
         )
         
         logger.info(f"Updated parsed file with {len(successful_demos)} new demos")
     
-    # Final alphabetize of the parsed file to remove any duplicates
-    from commands.parser.utils import alphabetize_file
-    await alphabetize_file(files['parsed'], remove_duplicates=True)
-    logger.info(f"Final alphabetization and duplicate removal for {month} parsed file")
+    # Remove failed demos from the matchid files. They are re-read here rather than indexed up front,
+    # because the filters and scrapers may have appended new matches while the batch was running.
+    if failed_uuids:
+        for matchid_path in (files['ace_matchids'], files['quad_matchids']):
+            if not os.path.exists(matchid_path):
+                continue
+            try:
+                matchids = await retry_operation(lambda: async_read_file_lines(matchid_path))
+                updated_matchids = sorted(m for m in matchids if extract_uuid_from_demo_id(m) not in failed_uuids)
+                if len(updated_matchids) != len(matchids):
+                    await retry_operation(
+                        lambda: async_write_file_lines(matchid_path, updated_matchids, use_temp_file=True)
+                    )
+                    logger.info(f"Removed {len(matchids) - len(updated_matchids)} failed demos from {os.path.basename(matchid_path)}")
+            except Exception as e:
+                logger.error(f"Error removing failed demos from {os.path.basename(matchid_path)}: {str(e)}")
     
-    # Final alphabetize of the ace_matchids and quad_matchids files
+    # Final alphabetize of the rejected, ace_matchids and quad_matchids files - they are
+    # independent, so run them concurrently. The parsed file is already written sorted.
+    alphabetize_tasks = [alphabetize_file(files['rejected'], remove_duplicates=True)]
     for matchid_file in [files['ace_matchids'], files['quad_matchids']]:
         if os.path.exists(matchid_file):
-            await alphabetize_file(matchid_file, remove_duplicates=True, preserve_chronological=True)
-            logger.info(f"Final alphabetization and duplicate removal for {os.path.basename(matchid_file)}")
+            alphabetize_tasks.append(alphabetize_file(matchid_file, remove_duplicates=True, preserve_chronological=True))
+    await asyncio.gather(*alphabetize_tasks)
+    logger.info(f"Final alphabetization and duplicate removal for {month} rejected and matchid files")
     
     # Calculate elapsed time
     elapsed_time = time.time() - start_time
-    parser_stats['processing_time'] += elapsed_time
+    parser_stats.processing_time += elapsed_time
     
     # Log summary if any demos were processed
     if stats['processed'] > 0:
@@ -426,7 +548,7 @@ async def process_month_queue_async(month: str, config: Dict, stop_event: asynci
     return stats, completion_message
 
 async def process_month_queue(month: str, limit: int = None, stop_event: asyncio.Event = None, 
-                             parser_stats: Dict = None) -> Tuple[Dict, str]:
+                             parser_stats: Optional[ParserStats] = None) -> Tuple[Dict, str]:
     """
     Process the parsing queue for a specific month (wrapper for async version)
     
@@ -434,7 +556,7 @@ async def process_month_queue(month: str, limit: int = None, stop_event: asyncio
         month: Month name (e.g., "February")
         limit: Maximum number of demos to process, or None for all
         stop_event: Optional event to signal stopping
-        parser_stats: Optional dictionary to track parser statistics
+        parser_stats: Optional parser statistics to update
         
     Returns:
         Tuple[Dict, str]: Processing statistics and completion message
@@ -18,6 +18,9 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum number of files cleaned concurrently
+MAX_CONCURRENT_CLEANUPS = 16
+
 async def clean_parsed_files(months: List[str] = None):
     """
     Clean up duplicate entries in parsed files for specified months
@@ -34,13 +37,21 @@ async def clean_parsed_files(months: List[str] = None):
     
     # If no months specified, get all month directories
     if not months:
-        months = []
-        for item in os.listdir(textfiles_dir):
-            if os.path.isdir(os.path.join(textfiles_dir, item)):
-                months.append(item)
+        with os.scandir(textfiles_dir) as entries:
+            months = [entry.name for entry in entries if entry.is_dir()]
     
     logger.info(f"Processing months: {', '.join(months)}")
     
+    # Limit how many files are rewritten at the same time
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLEANUPS)
+    
+    async def clean_file(file_path: str):
+        """Remove duplicates from a single file"""
+        async with semaphore:
+            logger.info(f"Cleaning duplicates in {file_path}")
+            await alphabetize_file(file_path, remove_duplicates=True)
+    
+    tasks = []
     for month in months:
         month_dir = os.path.join(textfiles_dir, month)
         month_lower = month.lower()
@@ -55,10 +66,12 @@ async def clean_parsed_files(months: List[str] = None):
         
         for file_path in files:
             if os.path.exists(file_path):
-                logger.info(f"Cleaning duplicates in {file_path}")
-                await alphabetize_file(file_path, remove_duplicates=True)
+                tasks.append(clean_file(file_path))
             else:
                 logger.warning(f"File not found: {file_path}")
+    
+    # Every file is independent, so clean them all concurrently
+    await asyncio.gather(*tasks)
 
 async def main():
     """Main entry point"""
@@ -3,34 +3,75 @@ Configuration functions for the parser module.
 """
 
 import os
+import copy
 import json
+import time
 import logging
 import asyncio
-from typing import Dict, Optional, List
+import functools
+from typing import Dict, Optional, List, Tuple
 
 logger = logging.getLogger('discord_bot')
 
+# Directories in the textfiles root that are never months
+_SKIP_DIRECTORIES = frozenset({'undated', 'MergeMe', 'System Volume Information'})
+
+# Demo directory -> (mtime_ns, {uuid: demo file path}) used by get_demo_path
+_dir_index_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+# Seconds a get_available_months result is reused before the textfiles directory is scanned again
+AVAILABLE_MONTHS_TTL = 60
+
+# Textfiles directory -> (expiry time, months) used by get_available_months
+_available_months_cache: Dict[str, Tuple[float, List[str]]] = {}
+
+# Parsed config.json and the mtime it was loaded at
+_CONFIG_CACHE: Optional[Dict] = None
+_CONFIG_MTIME: Optional[float] = None
+
 def get_config() -> Dict:
-    """Load configuration from config.json"""
+    """
+    Load configuration from config.json, reusing the parsed result until the file changes
+    
+    Every caller gets its own copy, so changing the returned dict never affects other callers.
+    """
+    global _CONFIG_CACHE, _CONFIG_MTIME
     try:
         core_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # DiscordBot directory
         config_path = os.path.join(os.path.dirname(core_dir), 'config.json')
         
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        # Only re-read the file when it has been modified since the last load
+        mtime = os.stat(config_path).st_mtime
+        if _CONFIG_CACHE is None or mtime != _CONFIG_MTIME:
+            with open(config_path, 'r') as f:
+                _CONFIG_CACHE = json.load(f)
+            _CONFIG_MTIME = mtime
+        
+        return copy.deepcopy(_CONFIG_CACHE)
     except Exception as e:
         logger.error(f"Error loading config: {str(e)}")
         return {}
 
-def get_month_files(month: str) -> Optional[Dict[str, str]]:
+async def get_config_async() -> Dict:
+    """Load configuration from config.json without blocking the event loop"""
+    return await asyncio.to_thread(get_config)
+
+def get_month_files(month: str, config: Optional[Dict] = None) -> Optional[Dict[str, str]]:
     """Get file paths for a specific month"""
-    config = get_config()
+    if config is None:
+        config = get_config()
     textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
     
     if not textfiles_dir:
         logger.error("Textfiles directory not found in config")
         return None
     
+    # Hand out a copy so callers can't corrupt the memoized entry
+    return dict(_build_month_files(textfiles_dir, month))
+
+@functools.lru_cache(maxsize=32)
+def _build_month_files(textfiles_dir: str, month: str) -> Dict[str, str]:
+    """Build (and memoize) the file paths for a month; only get_month_files should call this"""
     month_dir = os.path.join(textfiles_dir, month)
     month_lower = month.lower()
     
@@ -38,38 +79,51 @@ def get_month_files(month: str) -> Optional[Dict[str, str]]:
         'dir': month_dir,
         'downloaded': os.path.join(month_dir, f'downloaded_{month_lower}.txt'),
         'parsed': os.path.join(month_dir, f'parsed_{month_lower}.txt'),
-        'parse_queue': os.path.join(month_dir, f'parse_queue_{month_lower}.txt')
+        'parse_queue': os.path.join(month_dir, f'parse_queue_{month_lower}.txt'),
+        'rejected': os.path.join(month_dir, f'rejected_{month_lower}.txt'),
+        'ace_matchids': os.path.join(month_dir, f'ace_matchids_{month_lower}.txt'),
+        'quad_matchids': os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
     }
 
-def get_available_months() -> List[str]:
-    """Get list of available months with downloaded files"""
-    config = get_config()
+def get_available_months(config: Optional[Dict] = None) -> List[str]:
+    """Get list of available months with downloaded files, rescanning at most every AVAILABLE_MONTHS_TTL seconds"""
+    if config is None:
+        config = get_config()
     textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
     
+    cached = _available_months_cache.get(textfiles_dir)
+    if cached is not None and cached[0] > time.monotonic():
+        return list(cached[1])
+    
     if not textfiles_dir or not os.path.exists(textfiles_dir):
         logger.error(f"Textfiles directory not found: {textfiles_dir}")
         return []
     
     months = []
     try:
-        for item in os.listdir(textfiles_dir):
-            try:
-                item_path = os.path.join(textfiles_dir, item)
-                if os.path.isdir(item_path) and item not in ['undated', 'MergeMe', 'System Volume Information']:
+        with os.scandir(textfiles_dir) as entries:
+            for entry in entries:
+                try:
+                    # DirEntry.is_dir() answers from the directory listing, no extra stat
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    
                     # Skip system directories explicitly
-                    if item.lower() == 'system volume information':
+                    item = entry.name
+                    if item in _SKIP_DIRECTORIES or item.lower() == 'system volume information':
                         continue
-                        
+                    
                     # Check if there's a downloaded_{month}.txt file
-                    month_lower = item.lower()
-                    downloaded_file = os.path.join(item_path, f'downloaded_{month_lower}.txt')
+                    downloaded_file = os.path.join(entry.path, f'downloaded_{item.lower()}.txt')
                     if os.path.exists(downloaded_file):
                         months.append(item)
-            except PermissionError as e:
-                # Handle access denied errors for specific subdirectories
-                logger.warning(f"Permission denied when checking directory {item_path}: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error checking directory {item_path}: {str(e)}")
+                except PermissionError as e:
+                    # Handle access denied errors for specific subdirectories
+                    logger.warning(f"Permission denied when checking directory {entry.path}: {str(e)}")
+                except Exception as e:
+                    logger.error(f"Error checking directory {entry.path}: {str(e)}")
+        
+        _available_months_cache[textfiles_dir] = (time.monotonic() + AVAILABLE_MONTHS_TTL, list(months))
     except PermissionError as e:
         # Handle access denied errors for the main directory
         logger.error(f"Permission denied when listing textfiles directory {textfiles_dir}: {str(e)}")
@@ -78,18 +132,57 @@ def get_available_months() -> List[str]:
     
     return months
 
-def get_demo_path(demo_id: str, month: str) -> Optional[str]:
+def clear_available_months_cache():
+    """Forget cached get_available_months results, e.g. after month files were rebuilt"""
+    _available_months_cache.clear()
+
+async def get_available_months_async(config: Optional[Dict] = None) -> List[str]:
+    """Get list of available months with downloaded files without blocking the event loop"""
+    return await asyncio.to_thread(get_available_months, config)
+
+def _get_directory_index(directory: str) -> Dict[str, str]:
+    """
+    Get a mapping of demo UUID to demo file path for a directory
+    
+    The index is rebuilt with a single os.scandir pass whenever the directory's
+    mtime changes (i.e. files were added or removed), otherwise the cached one is used.
+    
+    Args:
+        directory: Directory containing .dem / .dem.gz files
+        
+    Returns:
+        Dict[str, str]: UUID -> full path of the first matching demo file
+    """
+    from commands.parser.utils import extract_uuid_from_demo_id
+    
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _dir_index_cache.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    index = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(('.dem', '.dem.gz')):
+                index.setdefault(extract_uuid_from_demo_id(entry.name.split('.', 1)[0]), entry.path)
+    
+    _dir_index_cache[directory] = (mtime, index)
+    return index
+
+def get_demo_path(demo_id: str, month: str, config: Optional[Dict] = None) -> Optional[str]:
     """
     Get the full path to a demo file
     
     Args:
         demo_id: Demo ID (e.g., "12-05-24_0101_1-72d8eb18-0bc8-49af-a738-55b792248b79" or "1-72d8eb18-0bc8-49af-a738-55b792248b79")
         month: Month name (e.g., "February")
+        config: Optional configuration dictionary, loaded from config.json if not provided
         
     Returns:
         Optional[str]: Full path to the demo file, or None if not found
     """
-    config = get_config()
+    if config is None:
+        config = get_config()
     demos_dir = config.get('project', {}).get('public_demos_directory', '')
     
     if not demos_dir:
@@ -140,13 +233,17 @@ def get_demo_path(demo_id: str, month: str) -> Optional[str]:
                     debug_logger.info(f"Found demo file at: {demo_path}")
                     return demo_path
                     
-            # If not found with direct match, try to find by partial match
-            if os.path.exists(directory):
-                for filename in os.listdir(directory):
-                    if match_id in filename and (filename.endswith('.dem') or filename.endswith('.dem.gz')):
-                        demo_path = os.path.join(directory, filename)
-                        debug_logger.info(f"Found demo file by partial match at: {demo_path}")
-                        return demo_path
+            # If not found with direct match, look the UUID up in the directory index
+            # (rebuilt only when the directory's mtime_ns changed, so a missing demo doesn't cost a scan)
+            index = _get_directory_index(directory)
+            demo_path = index.get(match_id)
+            if demo_path and not os.path.exists(demo_path):
+                # Deleted within the directory's timestamp resolution - drop the stale entry
+                index.pop(match_id, None)
+                demo_path = None
+            if demo_path:
+                debug_logger.info(f"Found demo file by partial match at: {demo_path}")
+                return demo_path
                         
         except PermissionError as e:
             logger.warning(f"Permission denied when checking directory {directory}: {str(e)}")
@@ -156,17 +253,17 @@ def get_demo_path(demo_id: str, month: str) -> Optional[str]:
     logger.warning(f"Demo file not found for ID: {demo_id}")
     return None
 
-async def get_demo_path_async(demo_id: str, month: str) -> Optional[str]:
+async def get_demo_path_async(demo_id: str, month: str, config: Optional[Dict] = None) -> Optional[str]:
     """
     Get the full path to a demo file asynchronously
     
     Args:
         demo_id: Demo ID (e.g., "12-05-24_0101_1-72d8eb18-0bc8-49af-a738-55b792248b79" or "1-72d8eb18-0bc8-49af-a738-55b792248b79")
         month: Month name (e.g., "February")
+        config: Optional configuration dictionary, loaded from config.json if not provided
         
     Returns:
         Optional[str]: Full path to the demo file, or None if not found
     """
-    # For now, we'll use the synchronous version since file operations are relatively fast
-    # and the async benefit would be minimal. This can be optimized later if needed.
-    return get_demo_path(demo_id, month)
+    # Run the blocking directory checks in a worker thread to keep the event loop free
+    return await asyncio.to_thread(get_demo_path, demo_id, month, config)
@@ -5,12 +5,14 @@ Functions for processing individual CS2 demo files.
 import os
 import sys
 import json
+import errno
 import logging
 import asyncio
 import re
-from typing import Dict, List, Counter
+import signal
+from typing import Dict, List, Tuple, Counter
 
-from commands.parser.utils import format_match_id, extract_short_id
+from commands.parser.utils import format_match_id, extract_short_id, ServiceOverloadError, ParserStats
 
 logger = logging.getLogger('discord_bot')
 debug_logger = logging.getLogger('debug_discord_bot')
@@ -18,6 +20,82 @@ debug_logger = logging.getLogger('debug_discord_bot')
 # Path to the parser scripts
 PARSER_INTERFACE = r"C:\demofetch\CSharpParser\demoparser-main\examples\demoparse_full\discord_interface.py"
 
+# OS errors that mean the host is out of resources rather than the demo being bad
+_OVERLOAD_ERRNOS = frozenset({errno.ENOMEM, errno.EMFILE, errno.ENFILE, errno.EAGAIN})
+
+# Default seconds a single parser subprocess may run before it is killed and the run counts as failed;
+# override with "parser_timeout_seconds" in the project section of config.json for slow hosts
+PARSER_TIMEOUT = 30 * 60
+
+# Exit code of a subprocess killed with SIGKILL, which is what the Linux OOM killer sends
+# (signal.SIGKILL doesn't exist on Windows)
+_SIGKILL_RETURNCODE = -getattr(signal, 'SIGKILL', 9)
+
+# Windows NTSTATUS exit codes of a process that ran out of memory
+# (STATUS_NO_MEMORY, STATUS_COMMITMENT_LIMIT)
+_OVERLOAD_EXIT_CODES = frozenset({0xC0000017, 0xC000012D})
+
+# Parser stderr markers of an out of memory failure (Python interpreter, .NET runtime)
+_OVERLOAD_STDERR_MARKERS = (b'MemoryError', b'OutOfMemoryException')
+
+def _is_overload_exit(returncode: int, stderr: bytes) -> bool:
+    """
+    Check whether a parser subprocess failed because the host ran out of resources
+    
+    Args:
+        returncode: Exit code of the subprocess
+        stderr: Captured stderr of the subprocess
+        
+    Returns:
+        bool: True for an out of memory exit or a SIGKILL (what the OOM killer sends)
+    """
+    if returncode == _SIGKILL_RETURNCODE:
+        return True
+    if (returncode & 0xFFFFFFFF) in _OVERLOAD_EXIT_CODES:
+        return True
+    return any(marker in stderr for marker in _OVERLOAD_STDERR_MARKERS)
+
+def _get_parser_timeout() -> float:
+    """Get the parser subprocess timeout in seconds from config, defaulting to PARSER_TIMEOUT"""
+    from commands.parser.config import get_config
+    return get_config().get('project', {}).get('parser_timeout_seconds', PARSER_TIMEOUT)
+
+async def _run_parser(*args: str, timeout: float = PARSER_TIMEOUT) -> Tuple[int, bytes, bytes]:
+    """
+    Run the parser interface with the given arguments
+    
+    The subprocess is killed if it runs longer than the timeout or the caller is cancelled.
+    
+    Args:
+        *args: Arguments for the parser interface (e.g., "killcollection", demo_path)
+        timeout: Seconds the subprocess may run
+        
+    Returns:
+        Tuple[int, bytes, bytes]: Exit code, stdout and stderr
+        
+    Raises:
+        asyncio.TimeoutError: If the parser did not finish within the timeout
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        PARSER_INTERFACE,
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise
+    
+    return process.returncode, stdout, stderr
+
 def count_tickbytick_by_type(output_files: List[str]) -> Dict[str, int]:
     """
     Count the number of tick-by-tick files by type (ACE, QUAD, TRIPLE, etc.)
@@ -40,7 +118,7 @@ def count_tickbytick_by_type(output_files: List[str]) -> Dict[str, int]:
     
     return counts
 
-async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: Dict, stop_event: asyncio.Event) -> bool:
+async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: ParserStats, stop_event: asyncio.Event) -> bool:
     """
     Process a single demo using the parser
     
@@ -48,7 +126,7 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
         demo_id: Demo ID
         demo_path: Path to the demo file
         month: Month name
-        parser_stats: Dictionary to track parser statistics
+        parser_stats: Parser statistics to update
         stop_event: Event to signal stopping
         
     Returns:
@@ -60,23 +138,20 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
         
         # Step 1: Process kill collection
         debug_logger.info("Running kill collection parser...")
-        kill_collection_cmd = [
-            sys.executable, 
-            PARSER_INTERFACE, 
-            "killcollection", 
-            demo_path
-        ]
-        
-        kill_collection_process = await asyncio.create_subprocess_exec(
-            *kill_collection_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        stdout, stderr = await kill_collection_process.communicate()
+        parser_timeout = _get_parser_timeout()
+        try:
+            returncode, stdout, stderr = await _run_parser("killcollection", demo_path, timeout=parser_timeout)
+        except asyncio.TimeoutError:
+            # A demo that keeps the parser busy this long is treated as bad, not as a host overload
+            logger.error(f"Kill collection parser timed out after {parser_timeout} seconds for demo {demo_id}")
+            print(f"[✗] Failed demo: {format_match_id(demo_id)} - Parser timed out")
+            return False
         
-        if kill_collection_process.returncode != 0:
-            logger.error(f"Kill collection parser failed with code {kill_collection_process.returncode}")
+        if returncode != 0:
+            # Running out of memory or being killed says nothing about the demo - let the caller back off and retry
+            if _is_overload_exit(returncode, stderr):
+                raise ServiceOverloadError(f"Kill collection parser ran out of resources (code {returncode}) for demo {demo_id}")
+            logger.error(f"Kill collection parser failed with code {returncode}")
             logger.error(f"Stderr: {stderr.decode()}")
             print(f"[✗] Failed demo: {format_match_id(demo_id)} - Parser error")
             return False
@@ -110,7 +185,7 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
                 return False
             
             # Update stats
-            parser_stats['kill_collections'] += len(output_files)
+            parser_stats.kill_collections += len(output_files)
             
             # Log success for kill collections
             print(f"[✓] Kill Collections wrote to master files ({short_id})")
@@ -144,23 +219,15 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
                         type_dir = os.path.join(tick_month_dir, collection_type)
                         os.makedirs(type_dir, exist_ok=True)
                 
-                tick_cmd = [
-                    sys.executable, 
-                    PARSER_INTERFACE, 
-                    "tickbytick", 
-                    csv_file
-                ]
-                
-                tick_process = await asyncio.create_subprocess_exec(
-                    *tick_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                tick_stdout, tick_stderr = await tick_process.communicate()
+                try:
+                    tick_returncode, tick_stdout, tick_stderr = await _run_parser("tickbytick", csv_file, timeout=parser_timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"Tick-by-tick parser timed out after {parser_timeout} seconds for: {csv_file}")
+                    # Continue with other files even if one fails
+                    continue
                 
-                if tick_process.returncode != 0:
-                    logger.error(f"Tick-by-tick parser failed with code {tick_process.returncode}")
+                if tick_returncode != 0:
+                    logger.error(f"Tick-by-tick parser failed with code {tick_returncode}")
                     logger.error(f"Stderr: {tick_stderr.decode()}")
                     # Continue with other files even if one fails
                     continue
@@ -202,7 +269,7 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
             type_counts = count_tickbytick_by_type(all_tickbytick_files)
             
             # Update stats
-            parser_stats['tickbytick_files'] += len(all_tickbytick_files)
+            parser_stats.tickbytick_files += len(all_tickbytick_files)
             
             # Log success for tick-by-tick with counts by type
             type_summary = " ".join([f"{count} {type}S" for type, count in sorted(type_counts.items())])
@@ -220,6 +287,17 @@ async def process_demo(demo_id: str, demo_path: str, month: str, parser_stats: D
             print(f"[✗] Failed demo: {format_match_id(demo_id)} - Invalid parser output")
             return False
         
+    except ServiceOverloadError:
+        raise
+    except MemoryError as e:
+        raise ServiceOverloadError(f"Out of memory processing demo {demo_id}") from e
+    except OSError as e:
+        # Resource exhaustion says nothing about the demo itself - let the caller back off and retry
+        if e.errno in _OVERLOAD_ERRNOS:
+            raise ServiceOverloadError(f"Out of resources processing demo {demo_id}: {str(e)}") from e
+        logger.error(f"Error processing demo {demo_id}: {str(e)}")
+        print(f"[✗] Failed demo: {format_match_id(demo_id)} - {str(e)}")
+        return False
     except Exception as e:
         logger.error(f"Error processing demo {demo_id}: {str(e)}")
         print(f"[✗] Failed demo: {format_match_id(demo_id)} - {str(e)}")
@@ -7,14 +7,14 @@ import logging
 import asyncio
 import re
 from datetime import datetime
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Collection, Dict, List, Set, Tuple, Optional
 
 from commands.parser.utils import (
     async_read_file_lines,
     async_write_file_lines,
     retry_operation,
-    create_uuid_only_file,
-    extract_uuid_from_demo_id
+    extract_uuid_from_demo_id,
+    alphabetize_lines
 )
 from commands.parser.config import get_config
 
@@ -22,6 +22,155 @@ logger = logging.getLogger('discord_bot')
 # Set up a separate logger for debug messages that won't be shown in console
 debug_logger = logging.getLogger('debug_discord_bot')
 
+# Match ID embedded in a demo filename (compiled once, used for every scanned file)
+_MATCH_ID_RE = re.compile(r'1-[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}')
+
+def _extract_match_id_from_filename(filename: str) -> Optional[str]:
+    """
+    Extract the match ID from a .dem filename
+    
+    Args:
+        filename: Demo filename ending in .dem
+        
+    Returns:
+        Optional[str]: The match ID, or None if it can't be extracted
+    """
+    # Remove .dem extension (callers only pass names ending in .dem)
+    base_name = filename[:-4]
+    
+    # Check if it's already exactly a match ID ("1-" + 36 character UUID); anything longer
+    # (e.g. a "_v2" suffix) goes through the regex so the suffix doesn't leak into the UUID
+    if (len(base_name) == 38 and base_name.startswith('1-') and base_name[10] == '-' and
+            base_name[15] == '-' and base_name[20] == '-' and base_name[25] == '-'):
+        return base_name
+    
+    # Try to extract match ID using regex
+    match = _MATCH_ID_RE.search(base_name)
+    if match:
+        return match.group(0)
+    
+    # If we can't extract a match ID, return None
+    return None
+
+def _scan_unarchived(dir_path: str) -> List[str]:
+    """
+    Find demos in a directory that have a .dem file but no .dem.gz archive
+    
+    Args:
+        dir_path: Directory to scan
+        
+    Returns:
+        List[str]: UUIDs of the unarchived demos (empty if the directory doesn't exist)
+    """
+    unarchived_demos = []
+    
+    try:
+        # One directory read; archived siblings are looked up by name instead of
+        # stat'ing a .dem.gz path for every .dem file. Only demo names are kept, and
+        # no per-file paths are built
+        with os.scandir(dir_path) as it:
+            filenames = [entry.name for entry in it if entry.name.endswith(('.dem', '.dem.gz'))]
+    except FileNotFoundError:
+        return unarchived_demos
+    except PermissionError as e:
+        # Handle access denied errors (e.g., for System Volume Information directory)
+        logger.warning(f"Permission denied when scanning directory {dir_path}: {str(e)}")
+        return unarchived_demos
+    except Exception as e:
+        logger.error(f"Error scanning directory {dir_path}: {str(e)}")
+        return unarchived_demos
+    
+    gz_names = {filename for filename in filenames if filename.endswith('.dem.gz')}
+    
+    for filename in filenames:
+        # Only process .dem files that don't have a corresponding .dem.gz file
+        if filename.endswith('.dem') and filename + '.gz' not in gz_names:
+            match_id = _extract_match_id_from_filename(filename)
+            if match_id:
+                # Extract UUID and add it directly without prefix
+                demo_uuid = extract_uuid_from_demo_id(match_id)
+                unarchived_demos.append(demo_uuid)
+    
+    if unarchived_demos:
+        # One summary line per directory rather than one per demo (lazily formatted)
+        debug_logger.info("Found %d unarchived demos in %s, adding UUIDs to queue: %s",
+                          len(unarchived_demos), dir_path, unarchived_demos)
+    
+    return unarchived_demos
+
+def _load_uuid_set_and_order(file_path: str) -> Tuple[List[str], Set[str]]:
+    """
+    Read a matchids file and extract its UUIDs
+    
+    Args:
+        file_path: Path to the ace/quad matchids file
+        
+    Returns:
+        Tuple[List[str], Set[str]]: UUIDs in file order and the set of those UUIDs
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        ordered_uuids = list(map(extract_uuid_from_demo_id, filter(None, map(str.strip, f))))
+    
+    return ordered_uuids, set(ordered_uuids)
+
+def _build_queue_stats(downloaded_demos: Set[str], parsed_demos: Set[str], unprocessed_demos: Set[str],
+                       unarchived_demos: List[str], queue: Collection[str]) -> Dict:
+    """Build the stats dictionary returned by prepare_parse_queue_async"""
+    return {
+        'total_downloaded': len(downloaded_demos),
+        'already_parsed': len(parsed_demos),
+        'unprocessed': len(unprocessed_demos),
+        'unarchived_demos': len(unarchived_demos),
+        'queue_size': len(queue)
+    }
+
+async def _collect_matchid_uuids(file_path: str, kind: str, month: str,
+                                 processable_uuids: Set[str]) -> Tuple[List[str], Set[str]]:
+    """
+    Find the processable UUIDs listed in a matchids file
+    
+    Args:
+        file_path: Path to the ace/quad matchids file
+        kind: Which matchids file this is ("ace" or "quad"), for logging
+        month: Month name (e.g., "February"), for logging
+        processable_uuids: UUIDs that are downloaded but not parsed or rejected
+        
+    Returns:
+        Tuple[List[str], Set[str]]: Processable UUIDs in file order, and all UUIDs in the file
+    """
+    # Opening directly (rather than checking existence first) costs one syscall for
+    # missing files; fresh months have neither matchids file
+    try:
+        reference_order, matchid_uuids = await asyncio.to_thread(_load_uuid_set_and_order, file_path)
+    except FileNotFoundError:
+        return [], set()
+    
+    if not reference_order:
+        return [], matchid_uuids
+    
+    logger.info(f"Processing {len(reference_order)} entries from {kind}_matchids file for {month}")
+    logger.info(f"Found {len(matchid_uuids)} UUIDs in {kind}_matchids file for {month}")
+    
+    # Find UUIDs from the matchids file that are processable in a single ordered pass over
+    # the reference list (dict.fromkeys drops repeats but keeps the original order)
+    if processable_uuids:
+        ordered_new_uuids = list(dict.fromkeys(uuid for uuid in reference_order if uuid in processable_uuids))
+    else:
+        ordered_new_uuids = []
+    
+    logger.info(f"Found {len(ordered_new_uuids)} UUIDs that are in both downloaded_demos and {kind}_matchids for {month}")
+    
+    if not ordered_new_uuids:
+        return [], matchid_uuids
+    
+    debug_logger.info("Adding %d %s matchid UUIDs to unprocessed demos: %s", len(ordered_new_uuids), kind, ordered_new_uuids)
+    logger.info(f"Added {len(ordered_new_uuids)} processable {kind} matchids to unprocessed demos")
+    
+    return ordered_new_uuids, matchid_uuids
+
 async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asyncio.Event = None, limit: int = None) -> Tuple[bool, Dict]:
     """
     Prepare parsing queue for a specific month asynchronously
@@ -59,17 +208,12 @@ async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asynci
     # Create month directory if it doesn't exist
     os.makedirs(files['dir'], exist_ok=True)
     
-    # Read downloaded, parsed, and rejected demos with retry
-    downloaded_demos = await retry_operation(
-        lambda: async_read_file_lines(files['downloaded'])
-    )
-    
-    parsed_demos = await retry_operation(
-        lambda: async_read_file_lines(files['parsed'])
-    )
-    
-    rejected_demos = await retry_operation(
-        lambda: async_read_file_lines(files['rejected'])
+    # Read downloaded, parsed, and rejected demos and the existing queue concurrently, with retry
+    downloaded_demos, parsed_demos, rejected_demos, existing_queue = await asyncio.gather(
+        retry_operation(lambda: async_read_file_lines(files['downloaded'])),
+        retry_operation(lambda: async_read_file_lines(files['parsed'])),
+        retry_operation(lambda: async_read_file_lines(files['rejected'])),
+        retry_operation(lambda: async_read_file_lines(files['parse_queue']))
     )
     
     # Initialize unprocessed_demos as an empty set
@@ -84,143 +228,43 @@ async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asynci
     
     # Create sets of UUIDs from downloaded, parsed, and rejected demos
     # These should already be in UUID format, but we'll extract just to be safe
-    downloaded_uuids = {extract_uuid_from_demo_id(demo) for demo in downloaded_demos}
-    parsed_uuids = {extract_uuid_from_demo_id(demo) for demo in parsed_demos}
-    rejected_uuids = {extract_uuid_from_demo_id(demo) for demo in rejected_demos}
-    
-    # Process ace_matchids file if it exists - using our new UUID-only file approach
-    if os.path.exists(ace_matchids_file):
-            # Get the reference order from the ace_matchids file
-            ace_reference_order = []
-            if os.path.exists(ace_matchids_file):
-                with open(ace_matchids_file, 'r', encoding='utf-8') as f:
-                    ace_matchids = [line.strip() for line in f if line.strip()]
-                    # Extract UUIDs while preserving order
-                    for matchid in ace_matchids:
-                        uuid = extract_uuid_from_demo_id(matchid)
-                        ace_reference_order.append(uuid)
-            
-            # Create a UUID-only version of the ace_matchids file with preserved order
-            ace_uuid_file = await create_uuid_only_file(ace_matchids_file, preserve_order=True)
-            
-            if ace_uuid_file:
-                # Read the UUID-only file as a list to preserve order
-                with open(ace_uuid_file, 'r', encoding='utf-8') as f:
-                    ace_uuids_list = [line.strip() for line in f if line.strip()]
-                
-                # Convert to set for efficient comparison
-                ace_uuids_set = set(ace_uuids_list)
-                
-                logger.info(f"Processing {len(ace_uuids_list)} entries from ace_matchids file for {month}")
-                
-                # Find UUIDs that are in downloaded_uuids but not in parsed_uuids or rejected_uuids
-                # This ensures we only process demos that have been downloaded
-                processable_uuids = downloaded_uuids - parsed_uuids - rejected_uuids
-                
-                logger.info(f"Found {len(processable_uuids)} processable UUIDs in downloaded_demos for {month}")
-                logger.info(f"Found {len(ace_uuids_set)} UUIDs in ace_matchids file for {month}")
-                
-                # Find UUIDs from ace_matchids that are processable
-                new_ace_uuids = ace_uuids_set.intersection(processable_uuids)
-                
-                logger.info(f"Found {len(new_ace_uuids)} UUIDs that are in both downloaded_demos and ace_matchids for {month}")
-                
-                # If we found processable UUIDs, add them to unprocessed_demos in their original order
-                if new_ace_uuids:
-                    # Add the UUIDs to unprocessed_demos in their original order from the reference list
-                    for uuid in ace_reference_order:
-                        if uuid in new_ace_uuids:
-                            unprocessed_demos.add(uuid)
-                            debug_logger.info(f"Adding ace matchid UUID {uuid} to unprocessed demos")
-                    
-                    logger.info(f"Added {len(new_ace_uuids)} processable ace matchids to unprocessed demos")
-                
-                # Clean up the temporary file
-                try:
-                    os.remove(ace_uuid_file)
-                    debug_logger.info(f"Removed temporary file: {ace_uuid_file}")
-                except Exception as e:
-                    debug_logger.error(f"Error removing temporary file {ace_uuid_file}: {str(e)}")
-    
-    # Process quad_matchids file if it exists - using our new UUID-only file approach
-    if os.path.exists(quad_matchids_file):
-        # Get the reference order from the quad_matchids file
-        quad_reference_order = []
-        if os.path.exists(quad_matchids_file):
-            with open(quad_matchids_file, 'r', encoding='utf-8') as f:
-                quad_matchids = [line.strip() for line in f if line.strip()]
-                # Extract UUIDs while preserving order
-                for matchid in quad_matchids:
-                    uuid = extract_uuid_from_demo_id(matchid)
-                    quad_reference_order.append(uuid)
-        
-        # Create a UUID-only version of the quad_matchids file with preserved order
-        quad_uuid_file = await create_uuid_only_file(quad_matchids_file, preserve_order=True)
-        
-        if quad_uuid_file:
-            # Read the UUID-only file as a list to preserve order
-            with open(quad_uuid_file, 'r', encoding='utf-8') as f:
-                quad_uuids_list = [line.strip() for line in f if line.strip()]
-            
-            # Convert to set for efficient comparison
-            quad_uuids_set = set(quad_uuids_list)
-            
-            logger.info(f"Processing {len(quad_uuids_list)} entries from quad_matchids file for {month}")
-            
-            # Find UUIDs that are in downloaded_uuids but not in parsed_uuids or rejected_uuids
-            # This ensures we only process demos that have been downloaded
-            processable_uuids = downloaded_uuids - parsed_uuids - rejected_uuids
-            
-            logger.info(f"Found {len(processable_uuids)} processable UUIDs in downloaded_demos for {month}")
-            logger.info(f"Found {len(quad_uuids_set)} UUIDs in quad_matchids file for {month}")
-            
-            # Find UUIDs from quad_matchids that are processable
-            new_quad_uuids = quad_uuids_set.intersection(processable_uuids)
-            
-            logger.info(f"Found {len(new_quad_uuids)} UUIDs that are in both downloaded_demos and quad_matchids for {month}")
-            
-            # If we found processable UUIDs, add them to unprocessed_demos in their original order
-            if new_quad_uuids:
-                # Add the UUIDs to unprocessed_demos in their original order from the reference list
-                for uuid in quad_reference_order:
-                    if uuid in new_quad_uuids:
-                        unprocessed_demos.add(uuid)
-                        debug_logger.info(f"Adding quad matchid UUID {uuid} to unprocessed demos")
-                
-                logger.info(f"Added {len(new_quad_uuids)} processable quad matchids to unprocessed demos")
-            
-            # Clean up the temporary file
-            try:
-                os.remove(quad_uuid_file)
-                debug_logger.info(f"Removed temporary file: {quad_uuid_file}")
-            except Exception as e:
-                debug_logger.error(f"Error removing temporary file {quad_uuid_file}: {str(e)}")
+    downloaded_uuids = set(map(extract_uuid_from_demo_id, downloaded_demos))
+    parsed_uuids = set(map(extract_uuid_from_demo_id, parsed_demos))
+    rejected_uuids = set(map(extract_uuid_from_demo_id, rejected_demos))
+    
+    # Find UUIDs that are in downloaded_uuids but not in parsed_uuids or rejected_uuids
+    # This ensures we only process demos that have been downloaded
+    processable_uuids = downloaded_uuids - parsed_uuids - rejected_uuids
+    
+    logger.info(f"Found {len(processable_uuids)} processable UUIDs in downloaded_demos for {month}")
+    
+    # The ace and quad matchids files are independent, so read and match them concurrently.
+    # Each file is read once; its UUID set is reused for the unarchived demo filtering below
+    (new_ace_uuids, ace_matchid_uuids), (new_quad_uuids, quad_matchid_uuids) = await asyncio.gather(
+        _collect_matchid_uuids(ace_matchids_file, 'ace', month, processable_uuids),
+        _collect_matchid_uuids(quad_matchids_file, 'quad', month, processable_uuids)
+    )
+    unprocessed_demos.update(new_ace_uuids)
+    unprocessed_demos.update(new_quad_uuids)
     
     # Log the summary results instead of each individual demo
     logger.info(f"Found {len(unprocessed_demos)} unprocessed demos for {month}")
         
     # Also remove any demos from downloaded_demos that are in rejected_demos
     # This ensures the downloaded file doesn't contain rejected demos
-    if rejected_demos:
-        demos_to_remove = downloaded_demos.intersection(rejected_demos)
-        if demos_to_remove:
-            logger.info(f"Found {len(demos_to_remove)} demos in downloaded file that are also in rejected file")
-            
-            # Update downloaded file to remove rejected demos
-            updated_downloaded = list(downloaded_demos - rejected_demos)
-            updated_downloaded.sort()  # Sort to maintain order
-            
-            # Write back to downloaded file
-            await retry_operation(
-                lambda: async_write_file_lines(files['downloaded'], updated_downloaded, use_temp_file=True)
-            )
-            
-            logger.info(f"Removed {len(demos_to_remove)} rejected demos from downloaded file")
-    
-    # Read existing queue with retry
-    existing_queue = await retry_operation(
-        lambda: async_read_file_lines(files['parse_queue'])
-    )
+    # (isdisjoint stops at the first overlap instead of building the intersection)
+    if rejected_demos and not downloaded_demos.isdisjoint(rejected_demos):
+        # Update downloaded file to remove rejected demos, sorted to maintain order
+        updated_downloaded = sorted(downloaded_demos.difference(rejected_demos))
+        removed_count = len(downloaded_demos) - len(updated_downloaded)
+        logger.info(f"Found {removed_count} demos in downloaded file that are also in rejected file")
+        
+        # Write back to downloaded file
+        await retry_operation(
+            lambda: async_write_file_lines(files['downloaded'], updated_downloaded, use_temp_file=True)
+        )
+        
+        logger.info(f"Removed {removed_count} rejected demos from downloaded file")
     
     # Add new demos to queue
     # If limit is specified, only add up to limit demos
@@ -230,23 +274,19 @@ async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asynci
         # Only take up to limit demos
         limited_unprocessed = unprocessed_list[:limit]
         logger.info(f"Limiting queue to {limit} demos (from {len(unprocessed_demos)} available)")
-        new_queue = list(existing_queue.union(limited_unprocessed))
+        existing_queue.update(limited_unprocessed)
     else:
-        new_queue = list(existing_queue.union(unprocessed_demos))
+        existing_queue.update(unprocessed_demos)
     
-    # Initialize stats dictionary
-    stats = {
-        'total_downloaded': len(downloaded_demos),
-        'already_parsed': len(parsed_demos),
-        'unprocessed': len(unprocessed_demos),
-        'unarchived_demos': 0,
-        'queue_size': len(new_queue)
-    }
+    # The queue is grown in place and only turned into a list when it's written
+    new_queue = existing_queue
+    
+    unarchived_demos = []
     
     # Check if stop event is set before scanning for unarchived demos
     if stop_event and stop_event.is_set():
         logger.info("Stop event detected, skipping unarchived demo scanning")
-        return True, stats
+        return True, _build_queue_stats(downloaded_demos, parsed_demos, unprocessed_demos, unarchived_demos, new_queue)
     
     # Scan for unarchived .dem files in the demos directory
     demos_dir = config.get('project', {}).get('public_demos_directory', '')
@@ -254,116 +294,35 @@ async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asynci
     if demos_dir:
         # Check both the month-specific directory and the root demos directory
         month_dir = os.path.join(demos_dir, month)
-        unarchived_demos = []
-        
-        # Function to extract match ID from filename
-        def extract_match_id_from_filename(filename):
-            # Remove .dem extension
-            base_name = filename.replace('.dem', '')
-            
-            # Check if it's already in the format we expect (match ID)
-            if base_name.startswith('1-'):
-                return base_name
-            
-            # Try to extract match ID using regex
-            match = re.search(r'1-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', base_name)
-            if match:
-                return match.group(0)
-            
-            # If we can't extract a match ID, return None
-            return None
-        
-        # Function to check if a .dem file has a corresponding .dem.gz file
-        def has_archived_version(dem_path):
-            gz_path = dem_path + '.gz'
-            return os.path.exists(gz_path)
-        
-        # Scan month directory
-        if os.path.exists(month_dir):
-            try:
-                for filename in os.listdir(month_dir):
-                    if filename.endswith('.dem') and not filename.endswith('.dem.gz'):
-                        dem_path = os.path.join(month_dir, filename)
-                        
-                        # Only process .dem files that don't have a corresponding .dem.gz file
-                        if not has_archived_version(dem_path):
-                            match_id = extract_match_id_from_filename(filename)
-                            if match_id:
-                                # Extract UUID and add it directly without prefix
-                                demo_uuid = extract_uuid_from_demo_id(match_id)
-                                unarchived_demos.append(demo_uuid)
-                                debug_logger.info(f"Found unarchived demo: {dem_path}, adding UUID {demo_uuid} to queue")
-            except PermissionError as e:
-                # Handle access denied errors (e.g., for System Volume Information directory)
-                logger.warning(f"Permission denied when scanning directory {month_dir}: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error scanning directory {month_dir}: {str(e)}")
-        
-        # Also scan the root demos directory
-        try:
-            if os.path.exists(demos_dir):
-                for filename in os.listdir(demos_dir):
-                    if filename.endswith('.dem') and not filename.endswith('.dem.gz'):
-                        dem_path = os.path.join(demos_dir, filename)
-                        
-                        # Only process .dem files that don't have a corresponding .dem.gz file
-                        if not has_archived_version(dem_path):
-                            match_id = extract_match_id_from_filename(filename)
-                            if match_id:
-                                # Extract UUID and add it directly without prefix
-                                demo_uuid = extract_uuid_from_demo_id(match_id)
-                                unarchived_demos.append(demo_uuid)
-                                debug_logger.info(f"Found unarchived demo in root directory: {dem_path}, adding UUID {demo_uuid} to queue")
-        except PermissionError as e:
-            # Handle access denied errors (e.g., for System Volume Information directory)
-            logger.warning(f"Permission denied when scanning root demos directory {demos_dir}: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error scanning root demos directory {demos_dir}: {str(e)}")
-            
-        # We already imported extract_uuid_from_demo_id at the top of the file
+        # The scans are blocking directory reads (slow on network shares), so run them
+        # on worker threads to keep the event loop responsive
+        month_unarchived, root_unarchived = await asyncio.gather(
+            asyncio.to_thread(_scan_unarchived, month_dir),
+            asyncio.to_thread(_scan_unarchived, demos_dir)
+        )
+        unarchived_demos = month_unarchived + root_unarchived
         
         # Create sets of UUIDs from parsed and rejected demos for unarchived demo filtering
-        parsed_uuids = {demo for demo in parsed_demos}
-        rejected_uuids = {demo for demo in rejected_demos}
+        parsed_uuids = set(parsed_demos)
+        rejected_uuids = set(rejected_demos)
         
-        # Get UUIDs from ace_matchids and quad_matchids files
-        ace_uuids_set = set()
-        quad_uuids_set = set()
-        
-        if os.path.exists(ace_matchids_file):
-            with open(ace_matchids_file, 'r', encoding='utf-8') as f:
-                ace_matchids_list = [line.strip() for line in f if line.strip()]
-                ace_uuids_set = {extract_uuid_from_demo_id(matchid) for matchid in ace_matchids_list}
-        
-        if os.path.exists(quad_matchids_file):
-            with open(quad_matchids_file, 'r', encoding='utf-8') as f:
-                quad_matchids_list = [line.strip() for line in f if line.strip()]
-                quad_uuids_set = {extract_uuid_from_demo_id(matchid) for matchid in quad_matchids_list}
-        
-        # Combine ace and quad UUIDs
-        matchids_uuids_set = ace_uuids_set.union(quad_uuids_set)
+        # Combine the ace and quad UUIDs read at the start
+        matchids_uuids_set = ace_matchid_uuids | quad_matchid_uuids
         
         # Filter unarchived demos to remove those that have already been parsed or rejected
-        # or are not in the ace_matchids or quad_matchids files
-        filtered_unarchived_demos = []
-        skipped_parsed_count = 0
-        skipped_rejected_count = 0
-        skipped_not_in_matchids_count = 0
+        # or are not in the ace_matchids or quad_matchids files, with a single exclusion set
+        # (_scan_unarchived already returns UUIDs, so there's nothing to extract here)
+        excluded_uuids = parsed_uuids | rejected_uuids
+        filtered_unarchived_demos = [
+            demo_uuid for demo_uuid in unarchived_demos
+            if demo_uuid in matchids_uuids_set and demo_uuid not in excluded_uuids
+        ]
         
-        for demo in unarchived_demos:
-            demo_uuid = extract_uuid_from_demo_id(demo)
-            if demo_uuid in parsed_uuids:
-                skipped_parsed_count += 1
-                debug_logger.info(f"Skipping already parsed unarchived demo (UUID match): {demo}")
-            elif demo_uuid in rejected_uuids:
-                skipped_rejected_count += 1
-                debug_logger.info(f"Skipping previously rejected unarchived demo (UUID match): {demo}")
-            elif demo_uuid not in matchids_uuids_set:
-                skipped_not_in_matchids_count += 1
-                debug_logger.info(f"Skipping unarchived demo not in matchids files: {demo}")
-            else:
-                # Add the UUID without prefix to the filtered list
-                filtered_unarchived_demos.append(demo_uuid)
+        # Work out why the rest were skipped with set operations, for the summary log only
+        skipped_uuids = set(unarchived_demos).difference(filtered_unarchived_demos)
+        skipped_parsed_count = len(skipped_uuids & parsed_uuids)
+        skipped_rejected_count = len((skipped_uuids - parsed_uuids) & rejected_uuids)
+        skipped_not_in_matchids_count = len(skipped_uuids) - skipped_parsed_count - skipped_rejected_count
         
         # Log summary of skipped demos
         if skipped_parsed_count > 0:
@@ -376,36 +335,21 @@ async def prepare_parse_queue_async(month: str, config: Dict, stop_event: asynci
         # Add filtered unarchived demos to the queue
         if filtered_unarchived_demos:
             logger.info(f"Adding {len(filtered_unarchived_demos)} unarchived demos to the queue for {month}")
-            new_queue = list(set(new_queue).union(set(filtered_unarchived_demos)))
+            new_queue.update(filtered_unarchived_demos)
     
-    # Use the alphabetize_file function to sort and remove duplicates
-    # First write the queue to the file
+    # Sort chronologically and remove duplicates in memory (as alphabetize_file does for
+    # parse queues), then write the queue once
+    new_queue = alphabetize_lines(new_queue, remove_duplicates=True, chronological=True, source=files['parse_queue'])
     await retry_operation(
         lambda: async_write_file_lines(files['parse_queue'], new_queue, use_temp_file=True)
     )
     
-    # Then alphabetize and remove duplicates
-    from commands.parser.utils import alphabetize_file
-    await alphabetize_file(files['parse_queue'], remove_duplicates=True, preserve_chronological=True)
-    
-    # Read the updated queue back
-    new_queue = list(await retry_operation(
-        lambda: async_read_file_lines(files['parse_queue'])
-    ))
-    
     logger.info(f"Alphabetized parse queue and removed duplicates for {month}")
     
-    stats = {
-        'total_downloaded': len(downloaded_demos),
-        'already_parsed': len(parsed_demos),
-        'unprocessed': len(unprocessed_demos),
-        'unarchived_demos': len(unarchived_demos) if 'unarchived_demos' in locals() else 0,
-        'queue_size': len(new_queue)
-    }
-    
-    return True, stats
+    return True, _build_queue_stats(downloaded_demos, parsed_demos, unprocessed_demos, unarchived_demos, new_queue)
 
-async def prepare_parse_queue(month: str, stop_event: asyncio.Event = None, limit: int = None) -> Tuple[bool, Dict]:
+async def prepare_parse_queue(month: str, stop_event: asyncio.Event = None, limit: int = None,
+                              config: Optional[Dict] = None) -> Tuple[bool, Dict]:
     """
     Prepare parsing queue for a specific month (wrapper for async version)
     
@@ -413,9 +357,11 @@ async def prepare_parse_queue(month: str, stop_event: asyncio.Event = None, limi
         month: Month name (e.g., "February")
         stop_event: Optional event to signal stopping
         limit: Maximum number of demos to add to the queue
+        config: Optional configuration dictionary, loaded from config.json if not provided
         
     Returns:
         Tuple[bool, Dict]: Success status and stats
     """
-    config = get_config()
+    if config is None:
+        config = get_config()
     return await prepare_parse_queue_async(month, config, stop_event, limit)
@@ -3,76 +3,240 @@ Functions for rebuilding parsed and downloaded files by scanning the appropriate
 """
 
 import os
-import glob
+import asyncio
+import functools
 import logging
-from typing import Tuple, Set, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Tuple, Set, List, Dict, Optional
 
 from commands.parser.config import get_config
-from commands.parser.utils import read_file_lines, write_file_lines, alphabetize_file, extract_uuid_from_demo_id
+from commands.parser.utils import read_file_lines, write_file_lines, extract_uuid_from_demo_id, has_prefix
 
 logger = logging.getLogger('discord_bot')
 debug_logger = logging.getLogger('debug_discord_bot')
 
-async def rebuild_parsed_file(month: str) -> Tuple[bool, str]:
+# Maximum number of months rebuilt concurrently
+MAX_CONCURRENT_MONTH_REBUILDS = 8
+
+# Worker threads for the rebuilders' blocking file I/O, sized for I/O rather than CPU so concurrent
+# month rebuilds don't queue up behind the rest of the bot in the event loop's default executor
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix='rebuilder')
+
+# Directories that are never month directories
+SYSTEM_DIRS = frozenset({'System Volume Information'})
+TEXTFILES_SKIP_DIRS = SYSTEM_DIRS | {'undated', 'MergeMe'}
+
+@dataclass(frozen=True, slots=True)
+class MonthPaths:
     """
-    Rebuild the parsed_[month].txt file by scanning the KillCollections directory
+    Paths of a single month's directories and text files
+    """
+    month_lower: str
+    month_dir: str
+    demos_month_dir: str
+    kill_collection_month_dir: str
+    parsed_file: str
+    downloaded_file: str
+    parse_queue_file: str
+    ace_file: str
+    quad_file: str
+    rejected_file: str
+
+@dataclass(frozen=True, slots=True)
+class RebuildPaths:
+    """
+    Directories used by the rebuilders, resolved from the configuration once per rebuild
+    """
+    textfiles_dir: str
+    demos_dir: str
+    kill_collection_path: str
+    
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'RebuildPaths':
+        """Build the paths from a configuration dictionary (loaded from config.json if not provided)"""
+        if config is None:
+            config = get_config()
+        project = config.get('project', {})
+        return cls(
+            textfiles_dir=project.get('textfiles_directory', ''),
+            demos_dir=project.get('public_demos_directory', ''),
+            kill_collection_path=project.get('KillCollectionParse', '')
+        )
+    
+    def for_month(self, month: str) -> MonthPaths:
+        """Get the paths of a month's directories and text files"""
+        return _month_paths(self.textfiles_dir, self.demos_dir, self.kill_collection_path, month)
+
+@functools.lru_cache(maxsize=64)
+def _month_paths(textfiles_dir: str, demos_dir: str, kill_collection_path: str, month: str) -> MonthPaths:
+    """Build (once per directory set and month) the paths of a month's directories and text files"""
+    month_dir = os.path.join(textfiles_dir, month)
+    month_lower = month.lower()
+    
+    def month_file(kind: str) -> str:
+        return os.path.join(month_dir, f'{kind}_{month_lower}.txt')
+    
+    return MonthPaths(
+        month_lower=month_lower,
+        month_dir=month_dir,
+        demos_month_dir=os.path.join(demos_dir, month),
+        kill_collection_month_dir=os.path.join(kill_collection_path, month),
+        parsed_file=month_file('parsed'),
+        downloaded_file=month_file('downloaded'),
+        parse_queue_file=month_file('parse_queue'),
+        ace_file=month_file('ace_matchids'),
+        quad_file=month_file('quad_matchids'),
+        rejected_file=month_file('rejected')
+    )
+
+async def _run_blocking(func: Callable, *args):
+    """Run a blocking function on the rebuilders' I/O thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_EXECUTOR, functools.partial(func, *args))
+
+def _month_dirs(root: str, skip: frozenset = SYSTEM_DIRS) -> Set[str]:
+    """
+    Get the month directory names under a root directory in a single scan
     
     Args:
-        month: Month name (e.g., "February")
+        root: Directory containing one subdirectory per month
+        skip: Directory names to leave out
         
     Returns:
-        Tuple[bool, str]: Success status and message
+        Set[str]: Month directory names (empty if the root doesn't exist)
     """
+    if not os.path.exists(root):
+        return set()
+    
+    with os.scandir(root) as it:
+        return {entry.name for entry in it if entry.is_dir() and entry.name not in skip}
+
+def _atomic_write_lines(file_path: str, lines: List[str]):
+    """Write lines to a temporary file and swap it in, so the file is never left half-written"""
+    temp_path = f"{file_path}.temp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        if lines:
+            # Write the trailing newline separately rather than copying the joined text to append it
+            f.write('\n'.join(lines))
+            f.write('\n')
+    os.replace(temp_path, file_path)
+
+def _ensure_empty_file(file_path: str):
+    """Make sure a file exists and is empty, without rewriting it when it already is"""
+    try:
+        if os.path.getsize(file_path) == 0:
+            return
+    except OSError:
+        pass
+    open(file_path, 'w', encoding='utf-8').close()
+
+def _read_stripped_lines(file_path: str) -> List[str]:
+    """Read the non-empty, stripped lines of a file with a single read (raises FileNotFoundError)"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return [line for line in map(str.strip, data.decode('utf-8').splitlines()) if line]
+
+def _dedupe_by_uuid(demo_ids: Iterable[str]) -> List[str]:
+    """
+    Keep one demo ID per UUID, preferring the date/time prefixed form, then the alphabetically first
+    
+    Args:
+        demo_ids: Demo IDs to de-duplicate
+        
+    Returns:
+        List[str]: The kept demo IDs, in no particular order
+    """
+    kept = {}  # uuid -> demo ID
+    for demo_id in demo_ids:
+        uuid = extract_uuid_from_demo_id(demo_id)
+        current = kept.get(uuid)
+        if current is None:
+            kept[uuid] = demo_id
+            continue
+        prefixed = has_prefix(demo_id)
+        current_prefixed = has_prefix(current)
+        if (prefixed and not current_prefixed) or (prefixed == current_prefixed and demo_id < current):
+            kept[uuid] = demo_id
+    return list(kept.values())
+
+async def _rebuild_months(rebuild: Callable[[str], Awaitable[Tuple[bool, str]]], months: List[str]) -> List[str]:
+    """
+    Run a per-month rebuild for several months concurrently
+    
+    Args:
+        rebuild: Rebuild coroutine function taking a month name
+        months: Month names, in the order the results should be reported
+        
+    Returns:
+        List[str]: One result line per month
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_MONTH_REBUILDS)
+    
+    async def rebuild_month(month: str) -> Tuple[bool, str]:
+        async with semaphore:
+            return await rebuild(month)
+    
+    outcomes = await asyncio.gather(*(rebuild_month(month) for month in months), return_exceptions=True)
+    
+    results = []
+    for month, outcome in zip(months, outcomes):
+        if isinstance(outcome, BaseException):
+            success, message = False, str(outcome)
+        else:
+            success, message = outcome
+        results.append(f"{month}: {'Success' if success else 'Failed'} - {message}")
+    
+    return results
+
+def _rebuild_parsed_file_sync(month: str, paths: Optional[RebuildPaths] = None) -> Tuple[bool, str]:
+    """Blocking implementation of rebuild_parsed_file"""
     try:
         # Get configuration
-        config = get_config()
-        kill_collection_path = config.get('project', {}).get('KillCollectionParse', '')
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
+        if paths is None:
+            paths = RebuildPaths.from_config()
+        kill_collection_path = paths.kill_collection_path
+        textfiles_dir = paths.textfiles_dir
         
         if not kill_collection_path or not textfiles_dir:
             return False, "Error: Could not find KillCollectionParse or textfiles directory in config"
         
         # Get month-specific paths
-        month_dir = os.path.join(textfiles_dir, month)
-        month_lower = month.lower()
-        parsed_file = os.path.join(month_dir, f'parsed_{month_lower}.txt')
+        month_paths = paths.for_month(month)
+        month_lower = month_paths.month_lower
+        parsed_file = month_paths.parsed_file
         
         # Create month directory if it doesn't exist
-        os.makedirs(month_dir, exist_ok=True)
+        os.makedirs(month_paths.month_dir, exist_ok=True)
         
         # Get the kill collection directory for this month
-        kill_collection_month_dir = os.path.join(kill_collection_path, month)
+        kill_collection_month_dir = month_paths.kill_collection_month_dir
         
         # If the kill collection directory doesn't exist, create an empty parsed file
         if not os.path.exists(kill_collection_month_dir):
             logger.info(f"Kill collection directory for {month} not found. Creating empty parsed file.")
-            with open(parsed_file, 'w', encoding='utf-8') as f:
-                pass  # Create an empty file
+            _ensure_empty_file(parsed_file)
             return True, f"Created empty parsed_{month_lower}.txt (no kill collections found)"
         
-        # Find all collection files in the month directory
-        collection_files = glob.glob(os.path.join(kill_collection_month_dir, "*_col.csv"))
+        # Extract demo IDs from the names of the collection files in the month directory
+        # (everything before the first underscore) in a single directory pass
+        demo_ids = set()
+        collection_file_count = 0
+        with os.scandir(kill_collection_month_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith("_col.csv") and entry.is_file(follow_symlinks=False):
+                    collection_file_count += 1
+                    demo_ids.add(name[:name.find('_')])
         
         # If no collection files found, create an empty parsed file
-        if not collection_files:
+        if not collection_file_count:
             logger.info(f"No collection files found for {month}. Creating empty parsed file.")
-            with open(parsed_file, 'w', encoding='utf-8') as f:
-                pass  # Create an empty file
+            _ensure_empty_file(parsed_file)
             return True, f"Created empty parsed_{month_lower}.txt (no collection files found)"
         
-        # Extract demo IDs from filenames
-        demo_ids = set()
-        for file_path in collection_files:
-            filename = os.path.basename(file_path)
-            # Extract everything before the first underscore
-            if '_' in filename:
-                demo_id = filename.split('_', 1)[0]
-                demo_ids.add(demo_id)
-        
         # Write to parsed file
-        with open(parsed_file, 'w', encoding='utf-8') as f:
-            for demo_id in sorted(demo_ids):
-                f.write(f"{demo_id}\n")
+        _atomic_write_lines(parsed_file, sorted(demo_ids))
         
         return True, f"Successfully rebuilt parsed_{month_lower}.txt with {len(demo_ids)} demo IDs"
     
@@ -80,87 +244,95 @@ async def rebuild_parsed_file(month: str) -> Tuple[bool, str]:
         logger.error(f"Error rebuilding parsed file for {month}: {str(e)}")
         return False, f"Error rebuilding parsed file: {str(e)}"
 
-async def rebuild_downloaded_file(month: str) -> Tuple[bool, str]:
+async def rebuild_parsed_file(month: str, paths: Optional[RebuildPaths] = None) -> Tuple[bool, str]:
     """
-    Rebuild the downloaded_{month}.txt file by scanning the demos directory
+    Rebuild the parsed_[month].txt file by scanning the KillCollections directory
     
     Args:
         month: Month name (e.g., "February")
+        paths: Optional directories to use, resolved from config.json if not provided
         
     Returns:
         Tuple[bool, str]: Success status and message
     """
+    return await _run_blocking(_rebuild_parsed_file_sync, month, paths)
+
+def _rebuild_downloaded_file_sync(month: str, paths: Optional[RebuildPaths] = None,
+                                  preserve_existing: bool = False) -> Tuple[bool, str]:
+    """Blocking implementation of rebuild_downloaded_file"""
     try:
         # Get configuration
-        config = get_config()
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-        demos_dir = config.get('project', {}).get('public_demos_directory', '')
+        if paths is None:
+            paths = RebuildPaths.from_config()
+        textfiles_dir = paths.textfiles_dir
+        demos_dir = paths.demos_dir
         
         if not textfiles_dir or not demos_dir:
             return False, "Error: Could not find textfiles or public_demos directory in config"
         
         # Get month-specific paths
-        month_dir = os.path.join(textfiles_dir, month)
-        month_lower = month.lower()
-        downloaded_file = os.path.join(month_dir, f'downloaded_{month_lower}.txt')
+        month_paths = paths.for_month(month)
+        month_lower = month_paths.month_lower
+        downloaded_file = month_paths.downloaded_file
         
         # Create month directory if it doesn't exist
-        os.makedirs(month_dir, exist_ok=True)
+        os.makedirs(month_paths.month_dir, exist_ok=True)
         
         # Get the demos directory for this month
-        demos_month_dir = os.path.join(demos_dir, month)
+        demos_month_dir = month_paths.demos_month_dir
         
         # If the demos directory doesn't exist, create an empty downloaded file
         if not os.path.exists(demos_month_dir):
             logger.info(f"Demos directory for {month} not found. Creating empty downloaded file.")
-            with open(downloaded_file, 'w', encoding='utf-8') as f:
-                pass  # Create an empty file
+            _ensure_empty_file(downloaded_file)
             return True, f"Created empty downloaded_{month_lower}.txt (no demos found)"
         
-        # Find all demo files in the month directory
-        demo_files = glob.glob(os.path.join(demos_month_dir, "*.dem")) + glob.glob(os.path.join(demos_month_dir, "*.dem.gz"))
+        # Extract demo IDs from the demo files in the month directory in a single directory pass
+        demo_ids = set()
+        demo_file_count = 0
+        with os.scandir(demos_month_dir) as it:
+            for entry in it:
+                filename = entry.name
+                # Remove the extension (.dem or .dem.gz)
+                if filename.endswith('.dem.gz'):
+                    demo_id = filename[:-7]  # Remove .dem.gz
+                elif filename.endswith('.dem'):
+                    demo_id = filename[:-4]  # Remove .dem
+                else:
+                    continue
+                
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                demo_file_count += 1
+                
+                # Check if this is a match ID (UUID format)
+                if '-' in demo_id:
+                    # This is likely a match ID in UUID format
+                    # Format it as expected in the downloaded file (with prefix if needed)
+                    # For now, we'll just add it as is
+                    demo_ids.add(demo_id)
         
         # If no demo files found, create an empty downloaded file
-        if not demo_files:
+        if not demo_file_count:
             logger.info(f"No demo files found for {month}. Creating empty downloaded file.")
-            with open(downloaded_file, 'w', encoding='utf-8') as f:
-                pass  # Create an empty file
+            _ensure_empty_file(downloaded_file)
             return True, f"Created empty downloaded_{month_lower}.txt (no demo files found)"
         
+        if not preserve_existing:
+            # Write to downloaded file, removing duplicates by UUID so the result only needs one sort
+            _atomic_write_lines(downloaded_file, sorted(_dedupe_by_uuid(demo_ids)))
+            return True, f"Successfully rebuilt downloaded_{month_lower}.txt with {len(demo_ids)} demo IDs"
+        
         # Read existing downloaded file if it exists
         existing_ids = set()
         if os.path.exists(downloaded_file):
             existing_ids = read_file_lines(downloaded_file)
         
-        # Extract demo IDs from filenames
-        demo_ids = set()
-        for file_path in demo_files:
-            filename = os.path.basename(file_path)
-            # Remove the extension (.dem or .dem.gz)
-            if filename.endswith('.dem.gz'):
-                demo_id = filename[:-7]  # Remove .dem.gz
-            elif filename.endswith('.dem'):
-                demo_id = filename[:-4]  # Remove .dem
-            else:
-                continue
-            
-            # Check if this is a match ID (UUID format)
-            if '-' in demo_id:
-                # This is likely a match ID in UUID format
-                # Format it as expected in the downloaded file (with prefix if needed)
-                # For now, we'll just add it as is
-                demo_ids.add(demo_id)
-        
         # Combine existing IDs with new ones
         all_ids = existing_ids.union(demo_ids)
         
-        # Write to downloaded file
-        with open(downloaded_file, 'w', encoding='utf-8') as f:
-            for demo_id in sorted(all_ids):
-                f.write(f"{demo_id}\n")
-        
-        # Remove duplicates by UUID
-        await alphabetize_file(downloaded_file, remove_duplicates=True)
+        # Write to downloaded file, removing duplicates by UUID so the result only needs one sort
+        _atomic_write_lines(downloaded_file, sorted(_dedupe_by_uuid(all_ids)))
         
         # Count how many new IDs were added
         new_count = len(demo_ids - existing_ids)
@@ -171,6 +343,21 @@ async def rebuild_downloaded_file(month: str) -> Tuple[bool, str]:
         logger.error(f"Error rebuilding downloaded file for {month}: {str(e)}")
         return False, f"Error rebuilding downloaded file: {str(e)}"
 
+async def rebuild_downloaded_file(month: str, paths: Optional[RebuildPaths] = None,
+                                  preserve_existing: bool = False) -> Tuple[bool, str]:
+    """
+    Rebuild the downloaded_{month}.txt file by scanning the demos directory
+    
+    Args:
+        month: Month name (e.g., "February")
+        paths: Optional directories to use, resolved from config.json if not provided
+        preserve_existing: Whether to keep IDs already in the file whose demos are no longer on disk
+        
+    Returns:
+        Tuple[bool, str]: Success status and message
+    """
+    return await _run_blocking(_rebuild_downloaded_file_sync, month, paths, preserve_existing)
+
 async def rebuild_all_downloaded_files() -> Tuple[bool, str]:
     """
     Rebuild downloaded files for all months by scanning the demos directory
@@ -179,28 +366,17 @@ async def rebuild_all_downloaded_files() -> Tuple[bool, str]:
         Tuple[bool, str]: Success status and message
     """
     try:
-        # Get configuration
-        config = get_config()
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-        demos_dir = config.get('project', {}).get('public_demos_directory', '')
+        # Get configuration once for every month
+        paths = RebuildPaths.from_config()
+        textfiles_dir = paths.textfiles_dir
+        demos_dir = paths.demos_dir
         
         if not textfiles_dir or not demos_dir:
             return False, "Error: Could not find textfiles or public_demos directory in config"
         
         # Get all month directories from both textfiles and demos
-        textfile_months = set()
-        demos_months = set()
-        
-        # Get months from textfiles directory
-        if os.path.exists(textfiles_dir):
-            textfile_months = {d for d in os.listdir(textfiles_dir) 
-                              if os.path.isdir(os.path.join(textfiles_dir, d)) 
-                              and d not in ['undated', 'MergeMe']}
-        
-        # Get months from demos directory
-        if os.path.exists(demos_dir):
-            demos_months = {d for d in os.listdir(demos_dir) 
-                           if os.path.isdir(os.path.join(demos_dir, d))}
+        textfile_months = _month_dirs(textfiles_dir, TEXTFILES_SKIP_DIRS)
+        demos_months = _month_dirs(demos_dir)
         
         # Combine both sets to get all months
         all_months = textfile_months.union(demos_months)
@@ -209,10 +385,7 @@ async def rebuild_all_downloaded_files() -> Tuple[bool, str]:
             return False, "No month directories found in either textfiles or demos"
         
         # Rebuild downloaded file for each month
-        results = []
-        for month in sorted(all_months):
-            success, message = await rebuild_downloaded_file(month)
-            results.append(f"{month}: {'Success' if success else 'Failed'} - {message}")
+        results = await _rebuild_months(functools.partial(rebuild_downloaded_file, paths=paths), sorted(all_months))
         
         return True, f"Rebuilt downloaded files for {len(all_months)} months:\n" + "\n".join(results)
     
@@ -228,28 +401,17 @@ async def rebuild_all_parsed_files() -> Tuple[bool, str]:
         Tuple[bool, str]: Success status and message
     """
     try:
-        # Get configuration
-        config = get_config()
-        kill_collection_path = config.get('project', {}).get('KillCollectionParse', '')
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
+        # Get configuration once for every month
+        paths = RebuildPaths.from_config()
+        kill_collection_path = paths.kill_collection_path
+        textfiles_dir = paths.textfiles_dir
         
         if not kill_collection_path or not textfiles_dir:
             return False, "Error: Could not find KillCollectionParse or textfiles directory in config"
         
         # Get all month directories from both textfiles and KillCollections
-        textfile_months = set()
-        kill_collection_months = set()
-        
-        # Get months from textfiles directory
-        if os.path.exists(textfiles_dir):
-            textfile_months = {d for d in os.listdir(textfiles_dir) 
-                              if os.path.isdir(os.path.join(textfiles_dir, d)) 
-                              and d not in ['undated', 'MergeMe']}
-        
-        # Get months from kill collection path
-        if os.path.exists(kill_collection_path):
-            kill_collection_months = {d for d in os.listdir(kill_collection_path) 
-                                     if os.path.isdir(os.path.join(kill_collection_path, d))}
+        textfile_months = _month_dirs(textfiles_dir, TEXTFILES_SKIP_DIRS)
+        kill_collection_months = _month_dirs(kill_collection_path)
         
         # Combine both sets to get all months
         all_months = textfile_months.union(kill_collection_months)
@@ -258,10 +420,7 @@ async def rebuild_all_parsed_files() -> Tuple[bool, str]:
             return False, "No month directories found in either textfiles or KillCollections"
         
         # Rebuild parsed file for each month
-        results = []
-        for month in sorted(all_months):
-            success, message = await rebuild_parsed_file(month)
-            results.append(f"{month}: {'Success' if success else 'Failed'} - {message}")
+        results = await _rebuild_months(functools.partial(rebuild_parsed_file, paths=paths), sorted(all_months))
         
         return True, f"Rebuilt parsed files for {len(all_months)} months:\n" + "\n".join(results)
     
@@ -269,132 +428,171 @@ async def rebuild_all_parsed_files() -> Tuple[bool, str]:
         logger.error(f"Error rebuilding all parsed files: {str(e)}")
         return False, f"Error rebuilding all parsed files: {str(e)}"
 
-async def get_reference_order(month: str) -> List[str]:
-    """
-    Get a reference order of UUIDs from ace_matchids and quad_matchids files
-    
-    Args:
-        month: Month name (e.g., "February")
-        
-    Returns:
-        List[str]: Ordered list of UUIDs
-    """
-    config = get_config()
-    textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-    
-    month_dir = os.path.join(textfiles_dir, month)
-    month_lower = month.lower()
-    
-    ace_file = os.path.join(month_dir, f'ace_matchids_{month_lower}.txt')
-    quad_file = os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
+def _get_reference_order_sync(month: str, paths: Optional[RebuildPaths] = None) -> List[str]:
+    """Blocking implementation of get_reference_order"""
+    if paths is None:
+        paths = RebuildPaths.from_config()
+    month_paths = paths.for_month(month)
     
     reference_order = []
     seen_uuids = set()
     
-    # Process ace_matchids file first (higher priority)
-    if os.path.exists(ace_file):
-        with open(ace_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    uuid = extract_uuid_from_demo_id(line)
-                    if uuid not in seen_uuids:
-                        reference_order.append(uuid)
-                        seen_uuids.add(uuid)
-    
-    # Then process quad_matchids file
-    if os.path.exists(quad_file):
-        with open(quad_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    uuid = extract_uuid_from_demo_id(line)
-                    if uuid not in seen_uuids:
-                        reference_order.append(uuid)
-                        seen_uuids.add(uuid)
+    # Process ace_matchids file first (higher priority), then quad_matchids
+    for file_path in (month_paths.ace_file, month_paths.quad_file):
+        try:
+            lines = _read_stripped_lines(file_path)
+        except FileNotFoundError:
+            continue
+        for line in lines:
+            uuid = extract_uuid_from_demo_id(line)
+            if uuid not in seen_uuids:
+                reference_order.append(uuid)
+                seen_uuids.add(uuid)
     
     logger.info(f"Created reference order with {len(reference_order)} UUIDs for {month}")
     return reference_order
 
-async def sort_file_by_reference(file_path: str, reference_order: List[str], remove_duplicates: bool = True):
+async def get_reference_order(month: str, paths: Optional[RebuildPaths] = None) -> List[str]:
     """
-    Sort a file based on a reference order of UUIDs
+    Get a reference order of UUIDs from ace_matchids and quad_matchids files
     
     Args:
-        file_path: Path to the file to sort
-        reference_order: List of UUIDs in the desired order
-        remove_duplicates: Whether to remove duplicate entries
+        month: Month name (e.g., "February")
+        paths: Optional directories to use, resolved from config.json if not provided
+        
+    Returns:
+        List[str]: Ordered list of UUIDs
     """
+    return await _run_blocking(_get_reference_order_sync, month, paths)
+
+def _sort_file_by_reference_sync(file_path: str, reference_order: List[str], remove_duplicates: bool = True):
+    """Blocking implementation of sort_file_by_reference"""
     if not os.path.exists(file_path):
         logger.warning(f"File does not exist for sorting: {file_path}")
         return
     
     try:
         # Read all lines from the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
-        
-        # Create a mapping of UUIDs to lines
-        uuid_to_line = {}
-        for line in lines:
-            uuid = extract_uuid_from_demo_id(line)
-            uuid_to_line[uuid] = line
-        
-        # Create a new sorted list based on reference order
+        lines = _read_stripped_lines(file_path)
+        
+        # Create a mapping of UUIDs to lines (only the last line per UUID when removing duplicates)
+        uuid_to_lines: Dict[str, List[str]] = {}
+        if remove_duplicates:
+            for line in lines:
+                uuid_to_lines[extract_uuid_from_demo_id(line)] = [line]
+        else:
+            for line in lines:
+                uuid_to_lines.setdefault(extract_uuid_from_demo_id(line), []).append(line)
+        
+        # Create a new sorted list based on reference order, popping each placed UUID so the
+        # lookup and marking it as used is a single dict operation
         sorted_lines = []
+        pop = uuid_to_lines.pop
         for uuid in reference_order:
-            if uuid in uuid_to_line:
-                sorted_lines.append(uuid_to_line[uuid])
-                if remove_duplicates:
-                    # If we want to remove duplicates, mark this UUID as used
-                    uuid_to_line.pop(uuid)
+            uuid_lines = pop(uuid, None)
+            if uuid_lines is not None:
+                sorted_lines.extend(uuid_lines)
         
         # Add any remaining lines that weren't in the reference order
-        if uuid_to_line:
-            for line in sorted(uuid_to_line.values()):
-                sorted_lines.append(line)
+        if uuid_to_lines:
+            sorted_lines.extend(sorted(line for uuid_lines in uuid_to_lines.values() for line in uuid_lines))
         
         # Write the sorted lines back to the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for line in sorted_lines:
-                f.write(f"{line}\n")
+        _atomic_write_lines(file_path, sorted_lines)
         
         logger.info(f"Sorted file by reference order: {file_path}")
     
     except Exception as e:
         logger.error(f"Error sorting file by reference: {str(e)}")
 
-async def handle_rejected_demos(month: str, reference_order: List[str] = None):
+async def sort_file_by_reference(file_path: str, reference_order: List[str], remove_duplicates: bool = True):
+    """
+    Sort a file based on a reference order of UUIDs
+    
+    Args:
+        file_path: Path to the file to sort
+        reference_order: List of UUIDs in the desired order
+        remove_duplicates: Whether to remove duplicate entries
+    """
+    return await _run_blocking(_sort_file_by_reference_sync, file_path, reference_order, remove_duplicates)
+
+def _filter_file_inplace(file_path: str, rejected_uuids: Set[str], description: str):
+    """
+    Remove the lines whose UUID is rejected from a file
+    
+    Args:
+        file_path: Path to the file to filter (skipped if it doesn't exist)
+        rejected_uuids: UUIDs of the rejected demos
+        description: Name of the file for logging (e.g., "parsed")
+    """
+    try:
+        lines = _read_stripped_lines(file_path)
+    except FileNotFoundError:
+        return
+    
+    filtered_lines = [line for line in lines if extract_uuid_from_demo_id(line) not in rejected_uuids]
+    
+    # Leave the file untouched when none of its lines were rejected
+    if len(filtered_lines) != len(lines):
+        _atomic_write_lines(file_path, filtered_lines)
+    
+    logger.info(f"Removed {len(lines) - len(filtered_lines)} rejected UUIDs from {description} file")
+
+def _load_rejected_uuids(rejected_file: str) -> Set[str]:
+    """Read the rejected UUIDs, without opening the file when it is missing or empty"""
+    try:
+        if os.path.getsize(rejected_file) == 0:
+            return set()
+    except OSError:
+        return set()
+    
+    return set(map(extract_uuid_from_demo_id, _read_stripped_lines(rejected_file)))
+
+def _delete_rejected_demos(demos_month_dir: str, rejected_uuids: Set[str]):
+    """
+    Delete the demo files of rejected demos
+    
+    Args:
+        demos_month_dir: Demos directory for the month (skipped if it doesn't exist)
+        rejected_uuids: UUIDs of the rejected demos
+    """
+    if not os.path.exists(demos_month_dir):
+        return
+    
+    removed_count = 0
+    
+    # Match the directory's entries against the rejected demo filenames in one scan
+    # instead of probing two possible paths per rejected UUID
+    rejected_filenames = {f"{uuid}{ext}" for uuid in rejected_uuids for ext in ('.dem', '.dem.gz')}
+    with os.scandir(demos_month_dir) as it:
+        rejected_entries = [entry for entry in it if entry.name in rejected_filenames]
+    
+    for entry in rejected_entries:
+        try:
+            os.remove(entry.path)
+            removed_count += 1
+            logger.info(f"Deleted rejected demo file: {entry.path}")
+        except Exception as e:
+            logger.error(f"Error deleting demo file {entry.path}: {str(e)}")
+    
+    logger.info(f"Removed {removed_count} rejected demo files from demos directory")
+
+async def handle_rejected_demos(month: str, reference_order: List[str] = None,
+                                paths: Optional[RebuildPaths] = None):
     """
     Handle rejected demos by removing them from all relevant files and folders
     
     Args:
         month: Month name (e.g., "February")
         reference_order: Optional list of UUIDs in reference order
+        paths: Optional directories to use, resolved from config.json if not provided
     """
-    config = get_config()
-    textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-    demos_dir = config.get('project', {}).get('public_demos_directory', '')
-    
-    month_dir = os.path.join(textfiles_dir, month)
-    month_lower = month.lower()
-    
-    rejected_file = os.path.join(month_dir, f'rejected_{month_lower}.txt')
-    parsed_file = os.path.join(month_dir, f'parsed_{month_lower}.txt')
-    downloaded_file = os.path.join(month_dir, f'downloaded_{month_lower}.txt')
-    parse_queue_file = os.path.join(month_dir, f'parse_queue_{month_lower}.txt')
-    ace_file = os.path.join(month_dir, f'ace_matchids_{month_lower}.txt')
-    quad_file = os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
+    if paths is None:
+        paths = RebuildPaths.from_config()
+    month_paths = paths.for_month(month)
     
     # Read rejected UUIDs
-    rejected_uuids = set()
-    if os.path.exists(rejected_file):
-        with open(rejected_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    uuid = extract_uuid_from_demo_id(line)
-                    rejected_uuids.add(uuid)
+    rejected_uuids = await _run_blocking(_load_rejected_uuids, month_paths.rejected_file)
     
     if not rejected_uuids:
         logger.info(f"No rejected demos found for {month}")
@@ -402,150 +600,60 @@ async def handle_rejected_demos(month: str, reference_order: List[str] = None):
     
     logger.info(f"Found {len(rejected_uuids)} rejected UUIDs for {month}")
     
-    # Remove rejected UUIDs from parsed file
-    if os.path.exists(parsed_file):
-        with open(parsed_file, 'r', encoding='utf-8') as f:
-            parsed_lines = [line.strip() for line in f if line.strip()]
-        
-        filtered_lines = []
-        for line in parsed_lines:
-            uuid = extract_uuid_from_demo_id(line)
-            if uuid not in rejected_uuids:
-                filtered_lines.append(line)
-        
-        with open(parsed_file, 'w', encoding='utf-8') as f:
-            for line in filtered_lines:
-                f.write(f"{line}\n")
-        
-        logger.info(f"Removed {len(parsed_lines) - len(filtered_lines)} rejected UUIDs from parsed file")
-    
-    # Remove rejected UUIDs from downloaded file
-    if os.path.exists(downloaded_file):
-        with open(downloaded_file, 'r', encoding='utf-8') as f:
-            downloaded_lines = [line.strip() for line in f if line.strip()]
-        
-        filtered_lines = []
-        for line in downloaded_lines:
-            uuid = extract_uuid_from_demo_id(line)
-            if uuid not in rejected_uuids:
-                filtered_lines.append(line)
-        
-        with open(downloaded_file, 'w', encoding='utf-8') as f:
-            for line in filtered_lines:
-                f.write(f"{line}\n")
-        
-        logger.info(f"Removed {len(downloaded_lines) - len(filtered_lines)} rejected UUIDs from downloaded file")
-    
-    # Remove rejected UUIDs from parse queue file
-    if os.path.exists(parse_queue_file):
-        with open(parse_queue_file, 'r', encoding='utf-8') as f:
-            queue_lines = [line.strip() for line in f if line.strip()]
-        
-        filtered_lines = []
-        for line in queue_lines:
-            uuid = extract_uuid_from_demo_id(line)
-            if uuid not in rejected_uuids:
-                filtered_lines.append(line)
-        
-        with open(parse_queue_file, 'w', encoding='utf-8') as f:
-            for line in filtered_lines:
-                f.write(f"{line}\n")
-        
-        logger.info(f"Removed {len(queue_lines) - len(filtered_lines)} rejected UUIDs from parse queue file")
-    
-    # Remove rejected UUIDs from ace_matchids file
-    if os.path.exists(ace_file):
-        with open(ace_file, 'r', encoding='utf-8') as f:
-            ace_lines = [line.strip() for line in f if line.strip()]
-        
-        filtered_lines = []
-        for line in ace_lines:
-            uuid = extract_uuid_from_demo_id(line)
-            if uuid not in rejected_uuids:
-                filtered_lines.append(line)
-        
-        with open(ace_file, 'w', encoding='utf-8') as f:
-            for line in filtered_lines:
-                f.write(f"{line}\n")
-        
-        logger.info(f"Removed {len(ace_lines) - len(filtered_lines)} rejected UUIDs from ace_matchids file")
-    
-    # Remove rejected UUIDs from quad_matchids file
-    if os.path.exists(quad_file):
-        with open(quad_file, 'r', encoding='utf-8') as f:
-            quad_lines = [line.strip() for line in f if line.strip()]
-        
-        filtered_lines = []
-        for line in quad_lines:
-            uuid = extract_uuid_from_demo_id(line)
-            if uuid not in rejected_uuids:
-                filtered_lines.append(line)
-        
-        with open(quad_file, 'w', encoding='utf-8') as f:
-            for line in filtered_lines:
-                f.write(f"{line}\n")
-        
-        logger.info(f"Removed {len(quad_lines) - len(filtered_lines)} rejected UUIDs from quad_matchids file")
-    
-    # Delete rejected demo files
-    demos_month_dir = os.path.join(demos_dir, month)
-    if os.path.exists(demos_month_dir):
-        removed_count = 0
-        for uuid in rejected_uuids:
-            # Try to find and delete the demo file
-            for ext in ['.dem', '.dem.gz']:
-                demo_path = os.path.join(demos_month_dir, f"{uuid}{ext}")
-                if os.path.exists(demo_path):
-                    try:
-                        os.remove(demo_path)
-                        removed_count += 1
-                        logger.info(f"Deleted rejected demo file: {demo_path}")
-                    except Exception as e:
-                        logger.error(f"Error deleting demo file {demo_path}: {str(e)}")
-        
-        logger.info(f"Removed {removed_count} rejected demo files from demos directory")
-
-async def rebuild_files(month: str) -> Tuple[bool, str]:
+    # Remove rejected UUIDs from the parsed, downloaded, parse queue, ace_matchids and quad_matchids
+    # files and delete the rejected demo files, all concurrently as they touch different files
+    await asyncio.gather(
+        *(_run_blocking(_filter_file_inplace, file_path, rejected_uuids, description)
+          for file_path, description in ((month_paths.parsed_file, 'parsed'),
+                                         (month_paths.downloaded_file, 'downloaded'),
+                                         (month_paths.parse_queue_file, 'parse queue'),
+                                         (month_paths.ace_file, 'ace_matchids'),
+                                         (month_paths.quad_file, 'quad_matchids'))),
+        _run_blocking(_delete_rejected_demos, month_paths.demos_month_dir, rejected_uuids)
+    )
+
+async def rebuild_files(month: str, paths: Optional[RebuildPaths] = None) -> Tuple[bool, str]:
     """
     Rebuild both parsed and downloaded files for a specific month while preserving chronological order
     
     Args:
         month: Month name (e.g., "February")
+        paths: Optional directories to use, resolved from config.json if not provided
         
     Returns:
         Tuple[bool, str]: Success status and message
     """
     try:
         # Get configuration
-        config = get_config()
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-        demos_dir = config.get('project', {}).get('public_demos_directory', '')
-        kill_collection_path = config.get('project', {}).get('KillCollectionParse', '')
+        if paths is None:
+            paths = RebuildPaths.from_config()
+        textfiles_dir = paths.textfiles_dir
+        demos_dir = paths.demos_dir
+        kill_collection_path = paths.kill_collection_path
         
         if not textfiles_dir or not demos_dir or not kill_collection_path:
             return False, "Error: Could not find required directories in config"
         
         # Get month-specific paths
-        month_dir = os.path.join(textfiles_dir, month)
-        month_lower = month.lower()
+        month_paths = paths.for_month(month)
         
         logger.info(f"Starting rebuild for {month}")
         
         # Get reference order from ace_matchids and quad_matchids
-        reference_order = await get_reference_order(month)
+        reference_order = await get_reference_order(month, paths)
         
         if not reference_order:
             logger.warning(f"No reference order found for {month}. Will use alphabetical order.")
         
-        # Rebuild parsed file
-        parsed_success, parsed_message = await rebuild_parsed_file(month)
-        
-        # Rebuild downloaded file
-        downloaded_success, downloaded_message = await rebuild_downloaded_file(month)
+        # Rebuild parsed and downloaded files (independent of each other)
+        (parsed_success, parsed_message), (downloaded_success, downloaded_message) = await asyncio.gather(
+            rebuild_parsed_file(month, paths),
+            rebuild_downloaded_file(month, paths)
+        )
         
         # Sort files based on reference order if available
-        parsed_file = os.path.join(month_dir, f'parsed_{month_lower}.txt')
-        downloaded_file = os.path.join(month_dir, f'downloaded_{month_lower}.txt')
+        parsed_file = month_paths.parsed_file
+        downloaded_file = month_paths.downloaded_file
         
         if reference_order:
             if os.path.exists(parsed_file):
@@ -555,18 +663,13 @@ async def rebuild_files(month: str) -> Tuple[bool, str]:
                 await sort_file_by_reference(downloaded_file, reference_order)
         
         # Handle rejected demos
-        await handle_rejected_demos(month, reference_order)
+        await handle_rejected_demos(month, reference_order, paths)
         
         # Clean up parse queue file too
-        parse_queue_file = os.path.join(month_dir, f'parse_queue_{month_lower}.txt')
+        parse_queue_file = month_paths.parse_queue_file
         if os.path.exists(parse_queue_file):
-            # Read all demos from the file
-            with open(parse_queue_file, 'r', encoding='utf-8') as f:
-                queue_lines = [line.strip() for line in f if line.strip()]
-            
             # Clear the file since we're rebuilding
-            with open(parse_queue_file, 'w', encoding='utf-8') as f:
-                pass
+            await _run_blocking(_ensure_empty_file, parse_queue_file)
             
             logger.info(f"Cleared parse queue file for {month}")
         
@@ -586,37 +689,19 @@ async def rebuild_all_files() -> Tuple[bool, str]:
         Tuple[bool, str]: Success status and message
     """
     try:
-        # Get configuration
-        config = get_config()
-        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-        demos_dir = config.get('project', {}).get('public_demos_directory', '')
-        kill_collection_path = config.get('project', {}).get('KillCollectionParse', '')
+        # Get configuration once for every month
+        paths = RebuildPaths.from_config()
+        textfiles_dir = paths.textfiles_dir
+        demos_dir = paths.demos_dir
+        kill_collection_path = paths.kill_collection_path
         
         if not textfiles_dir or not demos_dir or not kill_collection_path:
             return False, "Error: Could not find required directories in config"
         
         # Get all month directories from both textfiles, demos, and KillCollections
-        textfile_months = set()
-        demos_months = set()
-        kill_collection_months = set()
-        
-        # Get months from textfiles directory
-        if os.path.exists(textfiles_dir):
-            textfile_months = {d for d in os.listdir(textfiles_dir) 
-                              if os.path.isdir(os.path.join(textfiles_dir, d)) 
-                              and d not in ['undated', 'MergeMe', 'System Volume Information']}
-        
-        # Get months from demos directory
-        if os.path.exists(demos_dir):
-            demos_months = {d for d in os.listdir(demos_dir) 
-                           if os.path.isdir(os.path.join(demos_dir, d))
-                           and d not in ['System Volume Information']}
-        
-        # Get months from kill collection path
-        if os.path.exists(kill_collection_path):
-            kill_collection_months = {d for d in os.listdir(kill_collection_path) 
-                                     if os.path.isdir(os.path.join(kill_collection_path, d))
-                                     and d not in ['System Volume Information']}
+        textfile_months = _month_dirs(textfiles_dir, TEXTFILES_SKIP_DIRS)
+        demos_months = _month_dirs(demos_dir)
+        kill_collection_months = _month_dirs(kill_collection_path)
         
         # Combine all sets to get all months
         all_months = textfile_months.union(demos_months).union(kill_collection_months)
@@ -625,10 +710,7 @@ async def rebuild_all_files() -> Tuple[bool, str]:
             return False, "No month directories found in textfiles, demos, or KillCollections"
         
         # Rebuild files for each month
-        results = []
-        for month in sorted(all_months):
-            success, message = await rebuild_files(month)
-            results.append(f"{month}: {'Success' if success else 'Failed'} - {message}")
+        results = await _rebuild_months(functools.partial(rebuild_files, paths=paths), sorted(all_months))
         
         return True, f"Rebuilt files for {len(all_months)} months:\n" + "\n".join(results)
     
@@ -4,14 +4,19 @@ Service functions for the CS2 demo parser.
 
 import logging
 import asyncio
+import dataclasses
 import os
+import signal
 import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Tuple
 
-from commands.parser.utils import format_time_duration, alphabetize_file, extract_uuid_from_demo_id
-from commands.parser.config import get_config, get_available_months
-from commands.parser.queue_manager import prepare_parse_queue_async, prepare_parse_queue
+from commands.parser.utils import (
+    format_time_duration, alphabetize_file, extract_uuid_from_demo_id,
+    AdaptiveConcurrencyLimiter, ParserStats
+)
+from commands.parser.config import get_config, get_available_months, get_month_files
+from commands.parser.queue_manager import prepare_parse_queue
 from commands.parser.batch_processor import process_month_queue_async
 
 logger = logging.getLogger('discord_bot')
@@ -21,22 +26,277 @@ parser_task = None
 stop_parser_event = asyncio.Event()
 
 # Parser stats
-parser_stats = {
-    'total_processed': 0,
-    'successful': 0,
-    'failed': 0,
-    'last_demo_id': None,
-    'is_running': False,
-    'last_check_time': None,
-    'current_month': None,
-    'kill_collections': 0,
-    'tickbytick_files': 0,
-    'processing_time': 0
-}
+parser_stats = ParserStats()
 
-def get_parser_stats():
-    """Get current parser statistics"""
-    return parser_stats
+# Event loop the shutdown signal handlers were registered on
+_signal_loop = None
+
+# Number of months the all-months scan prepares and processes at the same time
+MONTH_CONCURRENCY = 2
+
+# Discord notifications sent when a one-time parser run completes
+COMPLETION_MESSAGE_MONTH = (
+    "🎉 **Parsing Complete for {month}!** 🎉\n\n"
+    "Successfully parsed {successful} demos, failed {failed}, skipped {skipped}.\n"
+    "Generated {kill_collections} kill collections and {tickbytick_files} tickbytick files in {duration}."
+)
+COMPLETION_MESSAGE_ALL = (
+    "🎉 **Parsing Complete!** 🎉\n\n"
+    "Successfully parsed {successful} demos, failed {failed}.\n"
+    "Generated {kill_collections} kill collections and {tickbytick_files} tickbytick files in {duration}."
+)
+
+# Month -> signature of its parse queue inputs when preparing the queue last found nothing to parse
+_empty_month_cache: Dict[str, Tuple] = {}
+
+def get_parser_stats() -> Dict:
+    """Get current parser statistics as a dictionary"""
+    return dataclasses.asdict(parser_stats)
+
+async def _alphabetize_month_files(files: Dict[str, str], include_matchids: bool = False):
+    """
+    Alphabetize a month's text files concurrently
+    
+    Args:
+        files: The month's file paths, as returned by get_month_files
+        include_matchids: Whether to also alphabetize the ace_matchids and quad_matchids files
+    """
+    # Alphabetize the parsed, parse_queue, and downloaded files (alphabetize_file skips files unchanged since
+    # it last sorted them)
+    tasks = [
+        alphabetize_file(files['parsed']),
+        alphabetize_file(files['parse_queue'], preserve_chronological=True),
+        alphabetize_file(files['downloaded'])
+    ]
+    
+    # Also alphabetize the ace_matchids and quad_matchids files (skipped if they don't exist)
+    if include_matchids:
+        tasks.append(alphabetize_file(files['ace_matchids'], preserve_chronological=True))
+        tasks.append(alphabetize_file(files['quad_matchids'], preserve_chronological=True))
+    
+    # The files are independent, so their reads, sorts and writes can overlap
+    await asyncio.gather(*tasks)
+
+def _month_file_entries(month_dir: str) -> Dict[str, os.DirEntry]:
+    """Get the files in a month directory by name with a single os.scandir pass (empty if it doesn't exist)"""
+    try:
+        with os.scandir(month_dir) as it:
+            return {entry.name: entry for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+def _queue_inputs_signature(config: Dict, month: str) -> Tuple:
+    """
+    Get the (mtime_ns, size) of every file and directory a month's parse queue is built from
+    
+    Args:
+        config: Configuration dictionary
+        month: Month name (e.g., "February")
+        
+    Returns:
+        Tuple: One (mtime_ns, size) entry per input, None for inputs that don't exist
+    """
+    signature = []
+    
+    # List the month's text files once, so missing ones cost no stat call at all
+    files = get_month_files(month, config)
+    if files:
+        entries = _month_file_entries(files['dir'])
+        for kind in ('downloaded', 'parsed', 'rejected', 'parse_queue', 'ace_matchids', 'quad_matchids'):
+            entry = entries.get(os.path.basename(files[kind]))
+            try:
+                st = entry.stat() if entry is not None else None
+            except OSError:
+                st = None
+            signature.append((st.st_mtime_ns, st.st_size) if st is not None else None)
+    
+    # Unarchived demos are picked up from the month's demos directory and the demos root
+    demos_dir = config.get('project', {}).get('public_demos_directory', '')
+    if demos_dir:
+        for path in (os.path.join(demos_dir, month), demos_dir):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+    
+    return tuple(signature)
+
+def _read_uuid_set_sync(file_path: str) -> Set[str]:
+    """Read the UUIDs of the demo IDs in a file, one line at a time so the file is never copied whole"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return {extract_uuid_from_demo_id(line) for line in map(str.strip, f) if line}
+    except FileNotFoundError:
+        return set()
+
+async def _read_uuid_set(file_path: str) -> Set[str]:
+    """Read the UUIDs of the demo IDs in a file (empty if the file doesn't exist)"""
+    return await asyncio.to_thread(_read_uuid_set_sync, file_path)
+
+async def _notify_complete(discord_bot, discord_user, template: str, **counts):
+    """
+    Send a parsing completion summary to the Discord user
+    
+    Does nothing unless both a bot and a user were provided.
+    
+    Args:
+        discord_bot: Discord bot used to send the message
+        discord_user: Discord user to notify
+        template: Message template, one of the COMPLETION_MESSAGE_* constants
+        **counts: Values for the template fields other than the parser totals
+    """
+    if not (discord_bot and discord_user):
+        return
+    
+    notification_message = template.format(
+        kill_collections=parser_stats.kill_collections,
+        tickbytick_files=parser_stats.tickbytick_files,
+        duration=format_time_duration(parser_stats.processing_time),
+        **counts
+    )
+    
+    try:
+        await discord_bot.send_message(discord_user, notification_message)
+        logger.info(f"Sent completion notification to {discord_user}")
+    except Exception as e:
+        logger.error(f"Failed to send completion notification: {str(e)}")
+
+async def _until_stopped(coro):
+    """
+    Run a coroutine, cancelling it as soon as the parser's stop event is set
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result, or None if the stop event was set first
+    """
+    task = asyncio.ensure_future(coro)
+    stop_task = asyncio.ensure_future(stop_parser_event.wait())
+    try:
+        await asyncio.wait({task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        stop_task.cancel()
+    
+    if task.done():
+        return task.result()
+    
+    # Let the cancelled coroutine run its cleanup before returning
+    task.cancel()
+    await asyncio.wait({task})
+    return None
+
+async def _process_one_month(month: str, config: Dict, textfiles_dir: str, parallel_limit: int,
+                             concurrency_limiter: AdaptiveConcurrencyLimiter) -> int:
+    """
+    Prepare and process the parse queue of one month in the all-months scan
+    
+    Args:
+        month: Month name (e.g., "February")
+        config: Configuration dictionary
+        textfiles_dir: Textfiles directory, the month's files are alphabetized afterwards if set
+        parallel_limit: Maximum number of demos to process in parallel
+        concurrency_limiter: Limiter shared by all months so the tuned parallelism carries over
+        
+    Returns:
+        int: Number of demos processed
+    """
+    # Check if stop event is set before processing the month
+    if stop_parser_event.is_set():
+        return 0
+    
+    _set_month_active(month, True)
+    try:
+        return await _process_month_scan(month, config, textfiles_dir, parallel_limit, concurrency_limiter)
+    finally:
+        _set_month_active(month, False)
+
+def _set_month_active(month: str, active: bool):
+    """Add a month to or remove it from the months in progress, keeping current_month in step"""
+    if active:
+        parser_stats.active_months.append(month)
+    else:
+        parser_stats.active_months.remove(month)
+    parser_stats.current_month = ', '.join(parser_stats.active_months) or None
+
+async def _process_month_scan(month: str, config: Dict, textfiles_dir: str, parallel_limit: int,
+                              concurrency_limiter: AdaptiveConcurrencyLimiter) -> int:
+    """Prepare and process one month's parse queue, see _process_one_month"""
+    # Skip months whose queue was empty last time, unless any of its inputs changed since
+    signature = await asyncio.to_thread(_queue_inputs_signature, config, month)
+    if _empty_month_cache.get(month) == signature:
+        logger.debug(f"Skipping {month}, nothing changed since its parse queue was last empty")
+        return 0
+    
+    # Prepare parse queue (no limit for all months mode), abandoning it if the parser is stopped
+    prepared = await _until_stopped(prepare_parse_queue(month, stop_parser_event))
+    if prepared is None:
+        return 0
+    success, prep_stats = prepared
+    
+    if not success:
+        logger.error(f"Failed to prepare parse queue for {month}")
+        return 0
+    
+    if prep_stats['queue_size'] == 0:
+        logger.info(f"No demos to parse for {month}")
+        # Preparing the queue may have rewritten its inputs, so record them afterwards
+        _empty_month_cache[month] = await asyncio.to_thread(_queue_inputs_signature, config, month)
+        return 0
+    
+    _empty_month_cache.pop(month, None)
+    
+    logger.info(f"Found {prep_stats['queue_size']} demos to parse for {month}")
+    
+    # Check if stop event is set before processing queue
+    if stop_parser_event.is_set():
+        return 0
+    
+    # Process the queue
+    stats, completion_message = await process_month_queue_async(
+        month, config, stop_parser_event, parser_stats, None, parallel_limit,
+        concurrency_limiter
+    )
+    
+    logger.info(f"Processed {stats['processed']} demos for {month}: "
+                f"{stats['successful']} successful, "
+                f"{stats['failed']} failed, "
+                f"{stats['skipped']} skipped "
+                f"(parallel limit now {concurrency_limiter.limit})")
+    
+    # Alphabetize the text files for this month, unless the batch didn't touch them
+    if textfiles_dir and stats['processed'] > 0:
+        await _alphabetize_month_files(get_month_files(month, config))
+        logger.info(f"Alphabetized text files for {month}")
+    
+    logger.info(completion_message)
+    
+    return stats['processed']
+
+def _signal_handler():
+    """Stop the parser loop on SIGINT/SIGTERM"""
+    logger.info("Received termination signal, setting stop event")
+    stop_parser_event.set()
+
+def _install_signal_handlers():
+    """Register the shutdown signal handlers on the running event loop, unless already done"""
+    global _signal_loop
+    loop = asyncio.get_running_loop()
+    if loop is _signal_loop:
+        return
+    
+    try:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, _signal_handler)
+        logger.info("Registered signal handlers for graceful shutdown")
+    except (NotImplementedError, RuntimeError):
+        # Windows doesn't support add_signal_handler, and it only works from the main thread
+        logger.info("Signal handlers not supported on this platform")
+    _signal_loop = loop
 
 async def parser_loop(specific_month: str = None, limit: int = None, parallel_limit: int = 5, 
                      discord_bot = None, discord_user = None, scan_interval: int = 300):
@@ -47,68 +307,55 @@ async def parser_loop(specific_month: str = None, limit: int = None, parallel_li
         specific_month: Optional month to process (e.g., "February")
                         If None, process all months with demos in queue
         limit: Maximum number of demos to process per scan, or None for all
-        parallel_limit: Maximum number of demos to process in parallel
+        parallel_limit: Maximum number of demos to process in parallel (lowered while the host is overloaded)
         discord_bot: Optional Discord bot instance for sending completion notifications
         discord_user: Optional Discord user to notify when parsing is complete
         scan_interval: Time in seconds to wait between scans for new demos (default: 5 minutes)
     """
-    # Set up signal handlers for graceful shutdown
-    import signal
+    # Set up signal handlers for graceful shutdown (once per event loop)
+    _install_signal_handlers()
     
-    def signal_handler():
-        logger.info("Received termination signal, setting stop event")
-        stop_parser_event.set()
-    
-    # Register signal handlers for graceful shutdown
-    try:
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            asyncio.get_event_loop().add_signal_handler(sig, signal_handler)
-        logger.info("Registered signal handlers for graceful shutdown")
-    except NotImplementedError:
-        # Windows doesn't support add_signal_handler
-        logger.info("Signal handlers not supported on this platform")
-        
     # Check if stop event is already set (in case this was called after a stop command)
     if stop_parser_event.is_set():
         logger.info("Stop event already set, not starting parser loop")
-        parser_stats['is_running'] = False
+        parser_stats.is_running = False
         return
     try:
         logger.info(f"Starting continuous parser loop{' for ' + specific_month if specific_month else ''}")
-        print(f"Starting continuous parser loop{' for ' + specific_month if specific_month else ''}")
-        parser_stats['is_running'] = True
+        parser_stats.is_running = True
         
         # Reset stats
-        parser_stats['kill_collections'] = 0
-        parser_stats['tickbytick_files'] = 0
-        parser_stats['processing_time'] = 0
+        parser_stats.kill_collections = 0
+        parser_stats.tickbytick_files = 0
+        parser_stats.processing_time = 0
         
-        # Get configuration
+        # Get configuration and the textfiles directory used after each month is processed
         config = get_config()
+        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
+        
+        # Shared across scans so the tuned parallelism carries over between batches
+        concurrency_limiter = AdaptiveConcurrencyLimiter(parallel_limit)
         
         # Main continuous loop - runs until stop event is set
         while not stop_parser_event.is_set():
-            scan_start_time = time.time()
+            scan_start_time = time.monotonic()
             logger.info(f"Starting new scan for demos to parse")
             
             # If specific month is provided, only process that month
             if specific_month:
-                parser_stats['current_month'] = specific_month
+                parser_stats.current_month = specific_month
                 
-                # Check if stop event is set before preparing queue
-                if stop_parser_event.is_set():
+                # Prepare parse queue with limit, abandoning it if the parser is stopped
+                prepared = await _until_stopped(prepare_parse_queue(specific_month, stop_parser_event, limit))
+                if prepared is None:
                     break
-                
-                # Prepare parse queue with limit
-                success, prep_stats = await prepare_parse_queue(specific_month, stop_parser_event, limit)
+                success, prep_stats = prepared
                 
                 if not success:
                     logger.error(f"Failed to prepare parse queue for {specific_month}")
-                    print(f"Failed to prepare parse queue for {specific_month}")
                 else:
                     if prep_stats['queue_size'] > 0:
                         logger.info(f"Found {prep_stats['queue_size']} demos to parse for {specific_month}")
-                        print(f"Found {prep_stats['queue_size']} demos to parse for {specific_month}")
                         
                         # Check if stop event is set before processing queue
                         if stop_parser_event.is_set():
@@ -116,58 +363,29 @@ async def parser_loop(specific_month: str = None, limit: int = None, parallel_li
                         
                         # Process the queue
                         stats, completion_message = await process_month_queue_async(
-                            specific_month, config, stop_parser_event, parser_stats, limit, parallel_limit
+                            specific_month, config, stop_parser_event, parser_stats, limit, parallel_limit,
+                            concurrency_limiter
                         )
                         
                         logger.info(f"Processed {stats['processed']} demos for {specific_month}: "
                                     f"{stats['successful']} successful, "
                                     f"{stats['failed']} failed, "
-                                    f"{stats['skipped']} skipped")
+                                    f"{stats['skipped']} skipped "
+                                    f"(parallel limit now {concurrency_limiter.limit})")
                         
-                        # Alphabetize the text files for this month
-                        textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-                        if textfiles_dir:
-                            month_dir = os.path.join(textfiles_dir, specific_month)
-                            month_lower = specific_month.lower()
-                            
-                            # Alphabetize the parsed, parse_queue, and downloaded files
-                            await alphabetize_file(os.path.join(month_dir, f'parsed_{month_lower}.txt'))
-                            await alphabetize_file(os.path.join(month_dir, f'parse_queue_{month_lower}.txt'), preserve_chronological=True)
-                            await alphabetize_file(os.path.join(month_dir, f'downloaded_{month_lower}.txt'))
-                            
-                            # Also alphabetize the ace_matchids and quad_matchids files if they exist
-                            ace_matchids_file = os.path.join(month_dir, f'ace_matchids_{month_lower}.txt')
-                            quad_matchids_file = os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
-                            
-                            if os.path.exists(ace_matchids_file):
-                                await alphabetize_file(ace_matchids_file, preserve_chronological=True)
-                            
-                            if os.path.exists(quad_matchids_file):
-                                await alphabetize_file(quad_matchids_file, preserve_chronological=True)
-                            
+                        # Alphabetize the text files for this month, unless the batch didn't touch them
+                        if textfiles_dir and stats['processed'] > 0:
+                            await _alphabetize_month_files(get_month_files(specific_month, config), include_matchids=True)
                             logger.info(f"Alphabetized text files for {specific_month}")
                         
-                        # Send completion notification if Discord bot and user are provided
-                        # Only send if not in continuous mode (scan_interval == 0 means one-time run)
-                        if discord_bot and discord_user and stats['processed'] > 0 and scan_interval == 0:
-                            notification_message = (
-                                f"🎉 **Parsing Complete for {specific_month}!** 🎉\n\n"
-                                f"Successfully parsed {stats['successful']} demos, "
-                                f"failed {stats['failed']}, "
-                                f"skipped {stats['skipped']}.\n"
-                                f"Generated {parser_stats['kill_collections']} kill collections and "
-                                f"{parser_stats['tickbytick_files']} tickbytick files "
-                                f"in {format_time_duration(parser_stats['processing_time'])}."
+                        # Send completion notification if not in continuous mode (scan_interval == 0 means one-time run)
+                        if stats['processed'] > 0 and scan_interval == 0:
+                            await _notify_complete(
+                                discord_bot, discord_user, COMPLETION_MESSAGE_MONTH, month=specific_month,
+                                successful=stats['successful'], failed=stats['failed'], skipped=stats['skipped']
                             )
-                            
-                            try:
-                                await discord_bot.send_message(discord_user, notification_message)
-                                logger.info(f"Sent completion notification to {discord_user}")
-                            except Exception as e:
-                                logger.error(f"Failed to send completion notification: {str(e)}")
                     else:
                         logger.info(f"No new demos to parse for {specific_month}")
-                        print(f"No new demos to parse for {specific_month}")
             
             # No specific month provided, process all months with demos in queue
             else:
@@ -177,97 +395,49 @@ async def parser_loop(specific_month: str = None, limit: int = None, parallel_li
                     
                     if not months:
                         logger.warning("No months with downloaded demos found")
-                        print("No months with downloaded demos found")
                     else:
-                        total_processed = 0
+                        # Process months concurrently, so preparing one month's queue overlaps with parsing another.
+                        # The months in progress are tracked in active_months. They all share concurrency_limiter,
+                        # which keeps the total number of parsers within parallel_limit.
+                        month_semaphore = asyncio.Semaphore(MONTH_CONCURRENCY)
+                        processing_time_before = parser_stats.processing_time
+                        months_start_time = time.monotonic()
                         
-                        # Process each month
-                        for month in months:
-                            # Check if stop event is set before processing each month
-                            if stop_parser_event.is_set():
-                                break
-                            
-                            parser_stats['current_month'] = month
-                            
-                            # Prepare parse queue (no limit for all months mode)
-                            success, prep_stats = await prepare_parse_queue(month, stop_parser_event)
-                            
-                            if not success:
-                                logger.error(f"Failed to prepare parse queue for {month}")
-                                continue
-                            
-                            if prep_stats['queue_size'] == 0:
-                                logger.info(f"No demos to parse for {month}")
-                                continue
-                            
-                            logger.info(f"Found {prep_stats['queue_size']} demos to parse for {month}")
-                            print(f"Found {prep_stats['queue_size']} demos to parse for {month}")
-                            
-                            # Check if stop event is set before processing queue
-                            if stop_parser_event.is_set():
-                                break
-                            
-                            # Process the queue
-                            stats, completion_message = await process_month_queue_async(
-                                month, config, stop_parser_event, parser_stats, None, parallel_limit
-                            )
-                            
-                            total_processed += stats['processed']
-                            
-                            logger.info(f"Processed {stats['processed']} demos for {month}: "
-                                        f"{stats['successful']} successful, "
-                                        f"{stats['failed']} failed, "
-                                        f"{stats['skipped']} skipped")
-                            
-                            # Alphabetize the text files for this month
-                            textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-                            if textfiles_dir:
-                                month_dir = os.path.join(textfiles_dir, month)
-                                month_lower = month.lower()
-                                
-                                # Alphabetize the parsed, parse_queue, and downloaded files
-                                await alphabetize_file(os.path.join(month_dir, f'parsed_{month_lower}.txt'))
-                                await alphabetize_file(os.path.join(month_dir, f'parse_queue_{month_lower}.txt'), preserve_chronological=True)
-                                await alphabetize_file(os.path.join(month_dir, f'downloaded_{month_lower}.txt'))
-                                
-                                logger.info(f"Alphabetized text files for {month}")
-                            
-                            print(completion_message)
+                        async def bounded_month(month: str) -> int:
+                            async with month_semaphore:
+                                return await _process_one_month(
+                                    month, config, textfiles_dir, parallel_limit, concurrency_limiter
+                                )
+                        
+                        results = await asyncio.gather(
+                            *(bounded_month(month) for month in months), return_exceptions=True
+                        )
+                        
+                        # Each month adds its own processing time, and overlapping months would be counted twice
+                        parser_stats.processing_time = processing_time_before + min(
+                            parser_stats.processing_time - processing_time_before,
+                            time.monotonic() - months_start_time
+                        )
+                        
+                        total_processed = 0
+                        for month, result in zip(months, results):
+                            if isinstance(result, Exception):
+                                logger.error(f"Error processing {month}: {str(result)}")
+                            else:
+                                total_processed += result
                         
-                        # Send completion notification if Discord bot and user are provided and demos were processed
-                        # Only send if not in continuous mode (scan_interval == 0 means one-time run)
-                        if discord_bot and discord_user and total_processed > 0 and scan_interval == 0:
-                            total_stats = {
-                                'total_processed': parser_stats['total_processed'],
-                                'successful': parser_stats['successful'],
-                                'failed': parser_stats['failed'],
-                                'kill_collections': parser_stats['kill_collections'],
-                                'tickbytick_files': parser_stats['tickbytick_files'],
-                                'processing_time': parser_stats['processing_time']
-                            }
-                            
-                            notification_message = (
-                                f"🎉 **Parsing Complete!** 🎉\n\n"
-                                f"Successfully parsed {total_stats['successful']} demos, "
-                                f"failed {total_stats['failed']}.\n"
-                                f"Generated {total_stats['kill_collections']} kill collections and "
-                                f"{total_stats['tickbytick_files']} tickbytick files "
-                                f"in {format_time_duration(total_stats['processing_time'])}."
+                        # Send completion notification if not in continuous mode (scan_interval == 0 means one-time run)
+                        if total_processed > 0 and scan_interval == 0:
+                            await _notify_complete(
+                                discord_bot, discord_user, COMPLETION_MESSAGE_ALL,
+                                successful=parser_stats.successful, failed=parser_stats.failed
                             )
-                            
-                            try:
-                                await discord_bot.send_message(discord_user, notification_message)
-                                logger.info(f"Sent completion notification to {discord_user}")
-                            except Exception as e:
-                                logger.error(f"Failed to send completion notification: {str(e)}")
                         
                         if total_processed == 0:
                             logger.info("No new demos to parse for any month")
-                            print("No new demos to parse for any month")
                     
                 except Exception as e:
                     logger.error(f"Error processing all months: {str(e)}")
-                    print(f"Error processing all months: {str(e)}")
             
             # Check if stop event is set before sleeping
             if stop_parser_event.is_set():
@@ -275,109 +445,67 @@ async def parser_loop(specific_month: str = None, limit: int = None, parallel_li
                 break
             
             # Calculate time to sleep (scan_interval minus time spent processing)
-            elapsed_time = time.time() - scan_start_time
+            elapsed_time = time.monotonic() - scan_start_time
             sleep_time = max(1, scan_interval - elapsed_time)
             
             logger.info(f"Scan complete. Sleeping for {int(sleep_time)} seconds before next scan...")
-            print(f"Scan complete. Sleeping for {int(sleep_time)} seconds before next scan...")
-            
-            # Sleep with periodic checks for stop event
-            sleep_interval = 1  # Check stop event every second
-            for _ in range(int(sleep_time / sleep_interval)):
-                if stop_parser_event.is_set():
-                    logger.info("Stop event detected during sleep, breaking out of parser loop")
-                    break
-                await asyncio.sleep(sleep_interval)
             
-            # Check stop event again before continuing to next iteration
-            if stop_parser_event.is_set():
-                logger.info("Stop event detected after sleep, breaking out of parser loop")
-                break
-                
-            # Sleep any remaining time
-            remaining_sleep = sleep_time % sleep_interval
-            if remaining_sleep > 0 and not stop_parser_event.is_set():
-                await asyncio.sleep(remaining_sleep)
-                
-            # Final check before next iteration
-            if stop_parser_event.is_set():
-                logger.info("Stop event detected after final sleep, breaking out of parser loop")
+            # Sleep until the next scan, waking up as soon as the stop event is set
+            try:
+                await asyncio.wait_for(stop_parser_event.wait(), timeout=sleep_time)
+                logger.info("Stop event detected during sleep, breaking out of parser loop")
                 break
+            except asyncio.TimeoutError:
+                pass
     
     except asyncio.CancelledError:
         logger.info("Parser task cancelled")
     
     finally:
-        parser_stats['is_running'] = False
-        parser_stats['current_month'] = None
+        parser_stats.is_running = False
+        parser_stats.current_month = None
+        parser_stats.active_months.clear()
         logger.info("Parser loop stopped")
-        print("Parser loop stopped")
 
-async def start_parsing(month: str, limit: int = None) -> str:
+async def start_parsing(month: str, limit: int = None, config: Optional[Dict] = None) -> str:
     """
     Start parsing demos from the specified month
     
     Args:
         month: Month name (e.g., "February")
         limit: Maximum number of demos to parse, or None for all
+        config: Optional configuration dictionary, loaded from config.json if not provided
         
     Returns:
         str: Initial message about the parsing operation
     """
+    # Get configuration
+    if config is None:
+        config = get_config()
+    
     # Validate month
     month = month.capitalize()
-    valid_months = get_available_months()
+    valid_months = get_available_months(config)
     if month not in valid_months:
         return f"Error: Invalid month '{month}'. Available months: {', '.join(valid_months)}"
     
-    # Get configuration
-    config = get_config()
-    
     # Get file paths for this month
-    textfiles_dir = config.get('project', {}).get('textfiles_directory', '')
-    if not textfiles_dir:
+    files = get_month_files(month, config)
+    if files is None:
         return "Error: Textfiles directory not found in config"
     
-    month_dir = os.path.join(textfiles_dir, month)
-    month_lower = month.lower()
-    
-    files = {
-        'downloaded': os.path.join(month_dir, f'downloaded_{month_lower}.txt'),
-        'parsed': os.path.join(month_dir, f'parsed_{month_lower}.txt'),
-        'rejected': os.path.join(month_dir, f'rejected_{month_lower}.txt'),
-        'ace_matchids': os.path.join(month_dir, f'ace_matchids_{month_lower}.txt'),
-        'quad_matchids': os.path.join(month_dir, f'quad_matchids_{month_lower}.txt')
-    }
-    
-    # Calculate eligible demos (downloaded but not parsed or rejected)
-    from commands.parser.utils import async_read_file_lines
-    
-    # Read all relevant files
-    downloaded_demos = await async_read_file_lines(files['downloaded'])
-    parsed_demos = await async_read_file_lines(files['parsed'])
-    rejected_demos = await async_read_file_lines(files['rejected'])
-    
-    # Read and combine ace and quad matchids
-    ace_matchids = set()
-    quad_matchids = set()
-    
-    if os.path.exists(files['ace_matchids']):
-        ace_demos = await async_read_file_lines(files['ace_matchids'])
-        ace_matchids = {extract_uuid_from_demo_id(demo) for demo in ace_demos}
-    
-    if os.path.exists(files['quad_matchids']):
-        quad_demos = await async_read_file_lines(files['quad_matchids'])
-        quad_matchids = {extract_uuid_from_demo_id(demo) for demo in quad_demos}
-    
-    matchids = ace_matchids.union(quad_matchids)
-    
-    # Convert to UUIDs for comparison
-    downloaded_uuids = {extract_uuid_from_demo_id(demo) for demo in downloaded_demos}
-    parsed_uuids = {extract_uuid_from_demo_id(demo) for demo in parsed_demos}
-    rejected_uuids = {extract_uuid_from_demo_id(demo) for demo in rejected_demos}
+    # Read all relevant files concurrently, straight into sets of UUIDs for comparison
+    downloaded_uuids, parsed_uuids, rejected_uuids, ace_uuids, quad_uuids = await asyncio.gather(
+        _read_uuid_set(files['downloaded']),
+        _read_uuid_set(files['parsed']),
+        _read_uuid_set(files['rejected']),
+        _read_uuid_set(files['ace_matchids']),
+        _read_uuid_set(files['quad_matchids'])
+    )
+    matchids = ace_uuids | quad_uuids
     
     # Calculate eligible demos (downloaded & in matchids, but not parsed or rejected)
-    eligible_uuids = downloaded_uuids.intersection(matchids) - parsed_uuids - rejected_uuids
+    eligible_uuids = downloaded_uuids.intersection(matchids).difference(parsed_uuids, rejected_uuids)
     eligible_count = len(eligible_uuids)
     
     # Prepare parse queue with limit
@@ -3,11 +3,16 @@ Utility functions for the parser module.
 """
 
 import os
+import re
 import logging
 import asyncio
+import bisect
+import functools
 import aiofiles
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from filelock import FileLock
-from typing import Set, List, Dict, Tuple, Optional, Counter, Any, Callable
+from typing import Set, List, Dict, Tuple, Optional, Counter, Any, Callable, Iterable
 
 logger = logging.getLogger('discord_bot')
 
@@ -81,25 +86,32 @@ async def async_read_file_lines(file_path: str) -> Set[str]:
 
 async def async_write_file_lines(file_path: str, lines: List[str], use_temp_file: bool = True):
     """Write lines to a file asynchronously with optional atomic update"""
+    # Build the content up front so the whole file goes out in a single write
+    content = ''.join(f"{line}\n" for line in lines)
     if use_temp_file:
         # Use a temporary file for atomic update
         temp_path = f"{file_path}.temp"
         async with aiofiles.open(temp_path, 'w', encoding='utf-8') as f:
-            for line in lines:
-                await f.write(f"{line}\n")
+            await f.write(content)
         # Atomic replace
         os.replace(temp_path, file_path)
     else:
         # Direct write
         async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-            for line in lines:
-                await f.write(f"{line}\n")
+            await f.write(content)
 
 async def async_append_file_line(file_path: str, line: str):
     """Append a line to a file asynchronously"""
     async with aiofiles.open(file_path, 'a', encoding='utf-8') as f:
         await f.write(f"{line}\n")
 
+async def async_append_file_lines(file_path: str, lines: List[str]):
+    """Append several lines to a file asynchronously with a single open and write"""
+    if not lines:
+        return
+    async with aiofiles.open(file_path, 'a', encoding='utf-8') as f:
+        await f.write(''.join(f"{line}\n" for line in lines))
+
 async def retry_operation(operation: Callable, max_retries: int = 3, initial_delay: float = 1.0):
     """
     Retry an async operation with exponential backoff
@@ -131,6 +143,84 @@ async def retry_operation(operation: Callable, max_retries: int = 3, initial_del
                 logger.error(f"Operation failed after {max_retries} attempts: {str(e)}")
                 raise last_exception
 
+# Default lower bound for the adaptive parser concurrency
+DEFAULT_MIN_CONCURRENCY = 2
+
+class ServiceOverloadError(Exception):
+    """Raised when a demo could not be processed because the host ran out of resources"""
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Async concurrency limiter that tunes its own limit from overload feedback
+    
+    Works like TCP congestion control (AIMD): the limit starts at max_concurrency, is
+    halved whenever an overload is reported and grows back by one after a full window
+    of successful runs. It never goes above max_concurrency.
+    
+    Usage:
+        async with limiter:
+            await do_work()
+        limiter.record_success()  # or limiter.record_overload()
+    """
+    
+    def __init__(self, max_concurrency: int, min_concurrency: int = DEFAULT_MIN_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = self.max_concurrency
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+    
+    def record_success(self):
+        """Additive increase: raise the limit by one after `limit` consecutive successes"""
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._successes = 0
+            debug_logger.info(f"Increased parser concurrency to {self.limit}")
+    
+    def record_overload(self):
+        """Multiplicative decrease: halve the limit, never going below the minimum"""
+        self.limit = max(self.min_concurrency, self.limit // 2)
+        self._successes = 0
+        logger.warning(f"Host overloaded, reduced parser concurrency to {self.limit}")
+
+@dataclass(slots=True)
+class ParserStats:
+    """Running parser statistics, shared by the parser loop and the batch processor"""
+    total_processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    last_demo_id: Optional[str] = None
+    is_running: bool = False
+    last_check_time: Optional[float] = None
+    current_month: Optional[str] = None
+    # Months the all-months scan is working on, current_month lists them while several overlap
+    active_months: List[str] = field(default_factory=list)
+    kill_collections: int = 0
+    tickbytick_files: int = 0
+    processing_time: float = 0.0
+
+# Standard match UUID ("1-" followed by a 36 character UUID) anywhere in a demo ID
+_UUID_RE = re.compile(r'(1-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
+
+def _looks_like_uuid(value: str) -> bool:
+    """Check the "1-" start and dash positions of a 38 character match UUID"""
+    return (value.startswith('1-') and value[10] == '-' and value[15] == '-' and
+            value[20] == '-' and value[25] == '-')
+
+@functools.lru_cache(maxsize=1_000_000)
 def extract_uuid_from_demo_id(demo_id: str) -> str:
     """
     Extract the UUID part from a demo ID
@@ -141,9 +231,18 @@ def extract_uuid_from_demo_id(demo_id: str) -> str:
     Returns:
         str: The UUID part of the demo ID (e.g., "1-8e335053-1a81-4746-bae7-ef7d2da0525e")
     """
+    # Fast path for stored entries that are already a bare UUID ("1-" + 36 character UUID)
+    if len(demo_id) == 38 and _looks_like_uuid(demo_id):
+        return demo_id
+    
+    # Fast path for prefixed entries ("MM-DD-YY_HHMM_" + bare UUID)
+    if len(demo_id) == 52 and demo_id[8] == '_' and demo_id[13] == '_':
+        uuid = demo_id[14:]
+        if _looks_like_uuid(uuid) and '_' not in uuid:
+            return uuid
+    
     # First, try to extract using a pattern match for the standard UUID format
-    import re
-    match = re.search(r'(1-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', demo_id)
+    match = _UUID_RE.search(demo_id)
     if match:
         return match.group(1)
     
@@ -184,6 +283,111 @@ def has_prefix(demo_id: str) -> bool:
             return True
     return False
 
+def alphabetize_lines(lines: Iterable[str], remove_duplicates: bool = True, chronological: bool = False,
+                      source: str = '') -> List[str]:
+    """
+    Sort lines and optionally remove duplicates based on UUID
+    
+    Args:
+        lines: Lines to sort
+        remove_duplicates: Whether to remove duplicate entries with the same UUID
+        chronological: Whether to sort prefixed entries by their date/time prefix
+        source: Name of where the lines came from, for debug logging
+        
+    Returns:
+        List[str]: The sorted lines
+    """
+    if remove_duplicates:
+        # Keep track of seen UUIDs and their corresponding full match IDs
+        seen_uuids = {}  # uuid -> full match ID
+        unique_lines = []
+        
+        # First, sort the lines alphabetically
+        sorted_lines = sorted(lines)
+        
+        # Process each line
+        extract_uuid = extract_uuid_from_demo_id
+        for line in sorted_lines:
+            uuid = extract_uuid(line)
+            
+            if uuid not in seen_uuids:
+                # First time seeing this UUID, add it
+                seen_uuids[uuid] = line
+                unique_lines.append(line)
+            else:
+                # We've seen this UUID before
+                existing_line = seen_uuids[uuid]
+                
+                # If the new line has a prefix and the existing one doesn't,
+                # replace the existing one with the new one
+                if has_prefix(line) and not has_prefix(existing_line):
+                    # Remove the existing line
+                    unique_lines.remove(existing_line)
+                    # Add the new line with prefix
+                    unique_lines.append(line)
+                    # Update the seen_uuids dictionary
+                    seen_uuids[uuid] = line
+                    debug_logger.info(f"Replaced {existing_line} with {line} (preferring prefixed version)")
+        
+        debug_logger.info(f"Removed {len(sorted_lines) - len(unique_lines)} duplicates from file: {source}")
+        sorted_lines = unique_lines
+    else:
+        # Just use the lines without removing duplicates
+        sorted_lines = list(lines)
+    
+    # Sort the lines based on the chronological flag
+    if chronological:
+        # For matchid files and parse queue files, we want to sort by date/time prefix if present
+        # This ensures older demos are processed first
+        def sort_key(line):
+            if has_prefix(line):
+                # Extract the date/time part for sorting
+                parts = line.split('_')
+                if len(parts) >= 2:
+                    # Return the date/time parts for sorting
+                    return parts[0] + '_' + parts[1]
+            # For lines without prefix, use the UUID
+            return extract_uuid_from_demo_id(line)
+        
+        sorted_lines.sort(key=sort_key)
+        debug_logger.info(f"Chronologically sorted file: {source}")
+    else:
+        # Standard alphabetical sort
+        sorted_lines.sort()
+        debug_logger.info(f"Alphabetically sorted file: {source}")
+    
+    return sorted_lines
+
+# Maximum number of sorted files whose last written state is kept so unchanged files aren't sorted again
+SORT_CACHE_SIZE = 16
+
+# File path -> ((chronological, remove_duplicates), text last written, its sorted lines, UUID -> kept line),
+# least recently used first; the UUID map is only kept for de-duplicated alphabetical files
+_sort_cache: 'OrderedDict[str, Tuple[Tuple[bool, bool], str, List[str], Dict[str, str]]]' = OrderedDict()
+
+def _merge_sorted_unique(sorted_lines: List[str], uuid_to_line: Dict[str, str], new_lines: Iterable[str]):
+    """
+    Merge lines into an alphabetically sorted list that holds one line per UUID, in place
+    
+    Gives the same result as alphabetize_lines over all the lines: per UUID the prefixed
+    form is kept over the bare one, otherwise the alphabetically first.
+    
+    Args:
+        sorted_lines: Sorted lines to merge into
+        uuid_to_line: UUID -> line kept in sorted_lines for that UUID
+        new_lines: Lines to merge in
+    """
+    for line in new_lines:
+        uuid = extract_uuid_from_demo_id(line)
+        existing = uuid_to_line.get(uuid)
+        if existing is not None:
+            prefixed, existing_prefixed = has_prefix(line), has_prefix(existing)
+            if not ((prefixed and not existing_prefixed) or (prefixed == existing_prefixed and line < existing)):
+                continue
+            del sorted_lines[bisect.bisect_left(sorted_lines, existing)]
+        bisect.insort(sorted_lines, line)
+        uuid_to_line[uuid] = line
+
 async def alphabetize_file(file_path: str, remove_duplicates: bool = True, preserve_chronological: bool = False):
     """
     Alphabetize the lines in a file and optionally remove duplicates based on UUID
@@ -195,71 +399,51 @@ async def alphabetize_file(file_path: str, remove_duplicates: bool = True, prese
     """
     if os.path.exists(file_path):
         try:
-            # Read all lines from the file
-            lines = await async_read_file_lines(file_path)
+            # Only matchid files and parse queue files are sorted chronologically
+            file_name = os.path.basename(file_path)
+            chronological = preserve_chronological and (
+                file_name.startswith(('ace_matchids', 'quad_matchids')) or 'parse_queue' in file_name
+            )
             
-            if remove_duplicates:
-                # Keep track of seen UUIDs and their corresponding full match IDs
-                seen_uuids = {}  # uuid -> full match ID
-                unique_lines = []
-                
-                # First, sort the lines alphabetically
-                sorted_lines = sorted(list(lines))
-                
-                # Process each line
-                for line in sorted_lines:
-                    uuid = extract_uuid_from_demo_id(line)
-                    
-                    if uuid not in seen_uuids:
-                        # First time seeing this UUID, add it
-                        seen_uuids[uuid] = line
-                        unique_lines.append(line)
-                    else:
-                        # We've seen this UUID before
-                        existing_line = seen_uuids[uuid]
-                        
-                        # If the new line has a prefix and the existing one doesn't,
-                        # replace the existing one with the new one
-                        if has_prefix(line) and not has_prefix(existing_line):
-                            # Remove the existing line
-                            unique_lines.remove(existing_line)
-                            # Add the new line with prefix
-                            unique_lines.append(line)
-                            # Update the seen_uuids dictionary
-                            seen_uuids[uuid] = line
-                            debug_logger.info(f"Replaced {existing_line} with {line} (preferring prefixed version)")
-                
-                sorted_lines = unique_lines
-                debug_logger.info(f"Removed {len(lines) - len(unique_lines)} duplicates from file: {file_path}")
-            else:
-                # Just use the lines without removing duplicates
-                sorted_lines = list(lines)
+            mode = (chronological, remove_duplicates)
             
-            # Sort the lines based on the preserve_chronological flag
-            if preserve_chronological and (os.path.basename(file_path).startswith(('ace_matchids', 'quad_matchids')) or 'parse_queue' in os.path.basename(file_path)):
-                # For matchid files and parse queue files, we want to sort by date/time prefix if present
-                # This ensures older demos are processed first
-                def sort_key(line):
-                    if has_prefix(line):
-                        # Extract the date/time part for sorting
-                        parts = line.split('_')
-                        if len(parts) >= 2:
-                            # Return the date/time parts for sorting
-                            return parts[0] + '_' + parts[1]
-                    # For lines without prefix, use the UUID
-                    return extract_uuid_from_demo_id(line)
-                
-                sorted_lines.sort(key=sort_key)
-                debug_logger.info(f"Chronologically sorted file: {file_path}")
+            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                content = await f.read()
+            
+            cached = _sort_cache.pop(file_path, None)
+            if cached is not None and (cached[0] != mode or not content.startswith(cached[1])):
+                cached = None
+            
+            if cached is not None and len(content) == len(cached[1]):
+                # Unchanged since this function last wrote it, so it is still sorted
+                _sort_cache[file_path] = cached
+                return
+            
+            if cached is not None and remove_duplicates and not chronological:
+                # Only lines were appended since the last sort, so merge them into the sorted lines
+                # instead of sorting the whole file again
+                _, written, sorted_lines, uuid_to_line = cached
+                new_lines = [line for line in map(str.strip, content[len(written):].splitlines()) if line]
+                _merge_sorted_unique(sorted_lines, uuid_to_line, new_lines)
+                debug_logger.info(f"Merged {len(new_lines)} appended lines into sorted file: {file_path}")
             else:
-                # Standard alphabetical sort
-                sorted_lines.sort()
-                debug_logger.info(f"Alphabetically sorted file: {file_path}")
+                lines = {line for line in map(str.strip, content.splitlines()) if line}
+                sorted_lines = alphabetize_lines(lines, remove_duplicates, chronological, file_path)
+                # Appended lines can only be merged into de-duplicated alphabetical files
+                uuid_to_line = {}
+                if remove_duplicates and not chronological:
+                    uuid_to_line = {extract_uuid_from_demo_id(line): line for line in sorted_lines}
             
             # Write the sorted lines back to the file
             await async_write_file_lines(file_path, sorted_lines, use_temp_file=True)
             
+            # Remember what was written, evicting the least recently sorted file
+            _sort_cache[file_path] = (mode, ''.join(f"{line}\n" for line in sorted_lines), sorted_lines, uuid_to_line)
+            if len(_sort_cache) > SORT_CACHE_SIZE:
+                _sort_cache.popitem(last=False)
+            
         except Exception as e:
+            _sort_cache.pop(file_path, None)
             logger.error(f"Error alphabetizing file {file_path}: {str(e)}")
 
 async def create_uuid_only_file(input_file_path: str, output_file_path: str = None, preserve_order: bool = True) -> str: